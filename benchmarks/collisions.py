@@ -0,0 +1,46 @@
+# benchmarks/collisions.py — broadphase scaling check for the entity spatial hash
+# Times bullet/enemy + enemy/player candidate collection with SpatialHash against the old nested loop
+# Run from the repo root: python -m benchmarks.collisions
+import random, time
+import pygame
+
+from src.utilities.spatial_hash import SpatialHash
+
+TILE_SIZE = 16
+WORLD_PX = (200 * TILE_SIZE, 110 * TILE_SIZE) # default world size
+
+class Body:
+    def __init__(self, size):
+        self.rect = pygame.Rect(random.randrange(WORLD_PX[0]), random.randrange(WORLD_PX[1]), size, size)
+
+def nested(enemies, bullets):
+    return [(e, b) for e in enemies for b in bullets if e.rect.colliderect(b.rect)]
+
+def hashed(enemies, bullets, grid):
+    grid.build(bullets)
+    return [(e, b) for e in enemies for b in grid.query(e.rect) if e.rect.colliderect(b.rect)]
+
+def timed(func, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+if __name__ == '__main__':
+    random.seed(0)
+    grid = SpatialHash(TILE_SIZE * 2)
+    print(f"{'entities':>8} {'nested ms':>10} {'hashed ms':>10} {'hashed us/entity':>17}")
+    for count in (100, 250, 500, 1000, 2000, 4000, 8000):
+        enemies = [Body(TILE_SIZE) for _ in range(count)]
+        bullets = [Body(TILE_SIZE // 2) for _ in range(count)]
+
+        hashed_time, pairs = timed(hashed, enemies, bullets, grid)
+        if count <= 2000: # the nested loop gets too slow past this
+            nested_time, expected = timed(nested, enemies, bullets, repeat=1)
+            assert set(map(lambda pair: (id(pair[0]), id(pair[1])), pairs)) == set(map(lambda pair: (id(pair[0]), id(pair[1])), expected))
+            nested_ms = f'{nested_time * 1000:10.1f}'
+        else:
+            nested_ms = f"{'-':>10}"
+        print(f'{count:>8} {nested_ms} {hashed_time * 1000:10.2f} {hashed_time / (count * 2) * 1e6:17.2f}')
@@ -0,0 +1,69 @@
+# benchmarks/enemies.py — per tick cost of EnemyManager against the batched NumPy backend
+# Steps the same pursuing crowd with both managers on a walled test grid, one enemy object per enemy vs array columns
+# A screen sized view sits on the player so far away enemies step less often, like in game
+# Run from the repo root: python -m benchmarks.enemies
+import os, random, time
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+import numpy as np
+
+from src.entities.enemy import EnemyManager
+from src.entities.enemy_batch import BatchedEnemyManager
+from src.tiling.collision import BlockingGrid
+from src.tiling.tilemap import BLOCKS_MOVEMENT
+from src.utilities.camera import View
+
+TILE_SIZE = 16
+WORLD_SIZE = (200, 110) # default world size in tiles
+TICKS = 60
+CENTER = (WORLD_SIZE[0] * TILE_SIZE / 2, WORLD_SIZE[1] * TILE_SIZE / 2)
+VIEW = View((CENTER[0] - 320, CENTER[1] - 180), (640, 360))
+
+class Layer:
+    # just what BlockingGrid reads from a TileMap
+    def __init__(self, flags):
+        self.tile_size = TILE_SIZE
+        self.origin = (0, 0)
+        self.size = flags.shape
+        self.flags = flags
+        self.codes = np.zeros(flags.shape, dtype=np.uint8)
+
+class Target:
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+def blocking_grid(rng):
+    flags = (rng.random(WORLD_SIZE) < 0.08).astype(np.uint8) * BLOCKS_MOVEMENT
+    flags[[0, -1], :] = flags[:, [0, -1]] = BLOCKS_MOVEMENT
+    return BlockingGrid(Layer(flags), Layer(np.zeros_like(flags)))
+
+def crowd(manager_class, count, seed):
+    random.seed(seed)
+    manager = manager_class(TILE_SIZE)
+    manager.dt = 1
+    for _ in range(count):
+        manager.spawn((random.randrange(1, WORLD_SIZE[0] - 1), random.randrange(1, WORLD_SIZE[1] - 1)))
+    manager.pursued = True # everyone chasing, the expensive case
+    return manager
+
+def timed(manager, player, grid, seed):
+    random.seed(seed) # dash swerves
+    start = time.perf_counter()
+    for tick in range(TICKS):
+        player.x = CENTER[0] + 200 * np.cos(tick / 10) # keeps the dashes turning
+        manager.update(1.0, player, grid, view=VIEW)
+    return (time.perf_counter() - start) / TICKS
+
+if __name__ == '__main__':
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    grid = blocking_grid(np.random.default_rng(0))
+    print(f"{'enemies':>8} {'objects ms':>11} {'batched ms':>11} {'speedup':>8}  enemies per update tier")
+    for count in (100, 250, 500, 1000, 2000, 4000):
+        objects = crowd(EnemyManager, count, count)
+        batched = crowd(BatchedEnemyManager, count, count)
+        object_time = timed(objects, Target(*CENTER), grid, count)
+        batched_time = timed(batched, Target(*CENTER), grid, count)
+        # both backends draw the same random numbers, so they must end up in the same places
+        assert [(enemy.x, enemy.y) for enemy in objects.enemies] == [(enemy.x, enemy.y) for enemy in batched.enemies]
+        print(f'{count:>8} {object_time * 1000:11.2f} {batched_time * 1000:11.2f} {object_time / batched_time:7.1f}x  {objects.scheduler.counts}')
@@ -0,0 +1,87 @@
+# benchmarks/gradients.py — cost of the surfarray gradients against the old per pixel & per row loops
+# Times the ocean radial gradient (set_at per cell) & the vertical background (draw.line per row), cold and cached
+# Run from the repo root: python -m benchmarks.gradients
+import os, time
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+
+from src.utilities.gradient import linear_gradient, radial_gradient
+from src.tiling.world import OCEAN_COLOURS
+
+BACKGROUND_COLOURS = ((185, 119, 255), (116, 65, 214), (35, 4, 84)) # main.py's GRADIENT_COLORS
+
+def set_at_radial(size, colours):
+    # how the ocean used to be built, one set_at per cell
+    inner_col, mid_col, outer_col = colours
+    surf = pygame.Surface(size).convert()
+    cx, cy = size[0]/2, size[1]/2
+    max_r = (cx**2 + cy**2) ** 0.5
+    for x in range(size[0]):
+        for y in range(size[1]):
+            dx = x - cx
+            dy = y - cy
+            t = min(((dx*dx + dy*dy) ** 0.5) / max_r, 1)
+            if t < 0.5:
+                tt = t*2
+                r = int(inner_col[0] + (mid_col[0]-inner_col[0])*tt)
+                g = int(inner_col[1] + (mid_col[1]-inner_col[1])*tt)
+                b = int(inner_col[2] + (mid_col[2]-inner_col[2])*tt)
+            else:
+                tt = (t-0.5)*2
+                r = int(mid_col[0] + (outer_col[0]-mid_col[0])*tt)
+                g = int(mid_col[1] + (outer_col[1]-mid_col[1])*tt)
+                b = int(mid_col[2] + (outer_col[2]-mid_col[2])*tt)
+            surf.set_at((x, y), (r, g, b))
+    return surf
+
+def line_linear(size, colors):
+    # how main.py's background used to be built, one draw.line per row
+    width, height = size
+    surf = pygame.Surface((width, height), pygame.SRCALPHA).convert_alpha()
+    segments = len(colors) - 1
+    segment_height = height / segments
+    for y in range(height):
+        seg_idx = int(y // segment_height)
+        seg_ratio = (y % segment_height) / segment_height
+        if seg_idx >= segments:
+            seg_idx = segments - 1
+            seg_ratio = 1
+        c1 = colors[seg_idx]
+        c2 = colors[seg_idx + 1]
+        r = int(c1[0] + (c2[0] - c1[0]) * seg_ratio)
+        g = int(c1[1] + (c2[1] - c1[1]) * seg_ratio)
+        b = int(c1[2] + (c2[2] - c1[2]) * seg_ratio)
+        pygame.draw.line(surf, (r, g, b), (0, y), (width, y))
+    return surf
+
+def timed(func, *args, repeat=3, cold=None, **kwargs):
+    best = float('inf')
+    for _ in range(repeat):
+        if cold:
+            cold()
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def same(a, b, tolerance):
+    # the per row floats of the old background land one below the arrays' in a few rows
+    diff = pygame.surfarray.array3d(a).astype(int) - pygame.surfarray.array3d(b)
+    return abs(diff).max() <= tolerance
+
+def compare(name, sizes, old, new, colours, min_speedup, **options):
+    for size in sizes:
+        old_time, expected = timed(old, size, colours, repeat=1)
+        cold_time, surf = timed(lambda: new(size, colours, **options), cold=new.cache_clear)
+        cached_time, _ = timed(new, size, colours, **options)
+        assert same(surf, expected, 1)
+        assert old_time / cold_time > min_speedup
+        print(f"{name:>6} {f'{size[0]}x{size[1]}':>9} {old_time * 1000:10.2f} {cold_time * 1000:10.2f} {cached_time * 1000:10.4f} {old_time / cold_time:7.1f}x")
+
+if __name__ == '__main__':
+    pygame.init()
+    pygame.display.set_mode((640, 360))
+    print(f"{'kind':>6} {'size':>9} {'old ms':>10} {'cold ms':>10} {'cached ms':>10} {'speedup':>8}")
+    # the ocean is one pixel per tile of the world, the background covers the window & is one fill per row at worst
+    compare('radial', ((200, 110), (400, 220), (800, 440)), set_at_radial, radial_gradient, OCEAN_COLOURS, 10)
+    compare('linear', ((640, 360), (1280, 720), (1920, 1080)), line_linear, linear_gradient, BACKGROUND_COLOURS, 1, alpha=True)
@@ -0,0 +1,79 @@
+# benchmarks/particles.py — per frame cost of ParticleSystem against one object per particle
+# Keeps a steady burst of particles alive on screen, drawing & updating them like Game.draw does
+# Run from the repo root: python -m benchmarks.particles
+import os, random, time
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+from pygame.math import Vector2 as vec2
+
+from src.effects.particle import ParticleSystem, COLORS
+
+TILE_SIZE = 16
+SIZE = (640, 360)
+WARMUP = 30 # frames until as many particles die as are spawned
+FRAMES = 30
+
+class Particle:
+    # how particles used to be kept, a list of these
+    def __init__(self, pos, angle):
+        self.pos = list(pos)
+        self.vel = vec2(1, 0).rotate(angle).normalize() * 4
+        self.radius = random.randint(TILE_SIZE//2, TILE_SIZE)
+        self.color = random.choice(COLORS)
+
+    def draw(self, draw_surf):
+        pygame.draw.circle(draw_surf, (10, 10, 10), (self.pos[0], self.pos[1] + 2), self.radius)
+        pygame.draw.circle(draw_surf, self.color, self.pos, self.radius)
+
+    def update(self, dt):
+        self.vel.x += (0 - self.vel.x) * 0.3 * dt
+        self.vel.y += (0 - self.vel.y) * 0.3 * dt
+        self.pos[0] += self.vel.x * dt
+        self.pos[1] += self.vel.y * dt
+        self.radius -= 0.5 * dt
+        return self.radius < 1
+
+def spawns(count):
+    # particles live ~16-30 frames, so this many per frame keeps about `count` alive
+    return [((random.uniform(0, SIZE[0]), random.uniform(0, SIZE[1])), random.uniform(0, 360)) for _ in range(count // 20)]
+
+def bursts(count):
+    # spawns for the warm up & timed frames, drawn before timing so only the particles are timed
+    random.seed(count)
+    return [spawns(count) for _ in range(WARMUP + FRAMES)]
+
+def objects(surf, count):
+    particles = []
+    for frame, burst in enumerate(bursts(count)):
+        if frame == WARMUP:
+            start = time.perf_counter()
+        particles += [Particle(pos, angle) for pos, angle in burst]
+        for particle in particles.copy():
+            particle.draw(surf)
+            if particle.update(1):
+                particles.remove(particle)
+    return (time.perf_counter() - start) / FRAMES, len(particles)
+
+def batched(surf, count):
+    particles = ParticleSystem(TILE_SIZE)
+    for frame, burst in enumerate(bursts(count)):
+        if frame == WARMUP:
+            start = time.perf_counter()
+        positions, angles = zip(*burst)
+        particles.emit_many(positions, angles)
+        particles.draw(surf, (0, 0))
+        particles.update(1)
+    return (time.perf_counter() - start) / FRAMES, len(particles)
+
+if __name__ == '__main__':
+    pygame.init()
+    surf = pygame.display.set_mode(SIZE)
+    print(f"{'particles':>9} {'objects ms':>11} {'batched ms':>11} {'speedup':>8}")
+    for count in (1000, 5000, 10000, 20000, 50000):
+        batched_time, alive = batched(surf, count)
+        if count <= 10000: # list.remove makes the old way crawl past this
+            object_time, object_alive = objects(surf, count)
+            assert alive == object_alive
+            print(f'{alive:>9} {object_time * 1000:11.2f} {batched_time * 1000:11.2f} {object_time / batched_time:7.1f}x')
+        else:
+            print(f'{alive:>9} {"-":>11} {batched_time * 1000:11.2f}')
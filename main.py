@@ -1,14 +1,10 @@
 # main.py — application entry point for "Escape From The Abyss"
-# Initializes pygame, creates the Game instance, and runs the async update/render loop
+# Initializes pygame, creates the Game instance, and runs the async update/render loop, only when run as a script
 # Adjusts window/FPS and delegates gameplay to src.game.Game
 import pygame
 import asyncio
 from src.game import Game
-
-pygame.init()
-
-window = pygame.display.set_mode([640, 360], pygame.SCALED)
-pygame.display.set_caption('1 Blast')
+from src.utilities.gradient import linear_gradient
 
 # Pre-render a vertical gradient background (inspired by supplied image palette)
 
@@ -21,44 +17,24 @@ GRADIENT_COLORS = [
 
 def generate_vertical_gradient(size, colors):
     """Return a Surface with a smooth vertical gradient through the given colors."""
-    width, height = size
-    surf = pygame.Surface((width, height), pygame.SRCALPHA).convert_alpha()
-
-    segments = len(colors) - 1
-    segment_height = height / segments
-
-    for y in range(height):
-        # Determine which segment this y falls into
-        seg_idx = int(y // segment_height)
-        seg_ratio = (y % segment_height) / segment_height
-
-        if seg_idx >= segments:
-            seg_idx = segments - 1
-            seg_ratio = 1
-
-        c1 = colors[seg_idx]
-        c2 = colors[seg_idx + 1]
-
-        r = int(c1[0] + (c2[0] - c1[0]) * seg_ratio)
-        g = int(c1[1] + (c2[1] - c1[1]) * seg_ratio)
-        b = int(c1[2] + (c2[2] - c1[2]) * seg_ratio)
-
-        pygame.draw.line(surf, (r, g, b), (0, y), (width, y))
-    return surf
-
-
-# Create once and reuse every frame
-gradient_bg = generate_vertical_gradient(window.get_size(), GRADIENT_COLORS)
-
-# Start game immediately (no homepage menu)
-game = Game(window)
-clock = pygame.time.Clock()
-font = pygame.font.Font(None, 32)
+    return linear_gradient(tuple(size), tuple(colors), alpha=True)
+
+
+# Generate the world chunk by chunk around the camera instead of all at once
+STREAM_WORLD = False
+# Processes used to generate the world, 0 = one per core
+WORLD_WORKERS = 1
+# Keep generated worlds on disk so seeds seen before load from a memory-mapped file
+WORLD_CACHE = False
+# Upper bound for the smoothly upsampled background chunks a world keeps around
+WORLD_MEMORY_MB = 32
+# Simulate enemies as NumPy arrays, worth it with hundreds of them on screen
+BATCH_ENEMIES = False
+# Only repaint & update what changed while the camera stands still, a full flip whenever it moves
+DIRTY_RECTS = False
 
 dt_setting = 60
 fps_event = pygame.USEREVENT
-pygame.time.set_timer(fps_event, 250)
-pygame.mouse.set_visible(0)
 
 
 async def run():
@@ -81,10 +57,31 @@ async def run():
         # Always update game state
         game.update(dt)
 
-        pygame.display.flip()
+        if game.changed is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(game.changed)
         await asyncio.sleep(0)
 
 
+# world generation workers import this module too, they must not open a window
 if __name__ == '__main__':
+    pygame.init()
+
+    window = pygame.display.set_mode([640, 360], pygame.SCALED)
+    pygame.display.set_caption('1 Blast')
+
+    # Create once and reuse every frame
+    gradient_bg = generate_vertical_gradient(window.get_size(), GRADIENT_COLORS)
+
+    # Start game immediately (no homepage menu)
+    game = Game(window, streaming=STREAM_WORLD, workers=WORLD_WORKERS, cache=WORLD_CACHE, memory_budget=WORLD_MEMORY_MB * 2**20, batch_enemies=BATCH_ENEMIES, dirty_rects=DIRTY_RECTS)
+    clock = pygame.time.Clock()
+    font = pygame.font.Font(None, 32)
+
+    pygame.time.set_timer(fps_event, 250)
+    pygame.mouse.set_visible(0)
+
     asyncio.run(run())
+    game.shutdown()
     # pygame.quit()
@@ -1,38 +1,256 @@
-# effects/particle.py — tiny particle sprite for explosions/hits
-# Moves outward with slowing velocity and shrinks until removed
-# Spawned on bullet impacts and enemy death
-import random, pygame
-from pygame.math import Vector2 as vec2
-
-class Particle:
-    def __init__(self, pos, angle, tile_size):
-        self.ori_pos = pos
-        self.pos = list(pos)
+# effects/particle.py — tiny particles for explosions/hits
+# Move outward with slowing velocity and shrink until removed
+# ParticleSystem keeps them all in NumPy arrays, dead slots are reused & drawing blits pre-rendered circles
+# Once thousands pile up, the ones later ones paint over are found per coarse screen cell & not blitted
+import math, random, pygame
+
+import numpy as np
+
+COLORS = ['#5e3ea8', '#7a56c8', '#a97dff']
+SHADOW = (10, 10, 10)
+KEY = (255, 0, 255) # transparent in circle stamps
+SHIFT = 2
+CELL = 1 << SHIFT # px, side of the screen cells hidden circles are found by
+OVERDRAW = 12 # times over circles paint the screen before looking for hidden ones costs less than blitting them
+MARKS = 3 # blocks of cells a particle marks as covered
+
+def levels(spans):
+    # the largest power of two level, 2**level <= span, of each span
+    return np.frexp(spans)[1] - 1
+
+def fold(blocks):
+    # blocks[level][i] holds what covers [i, i + 2**level) of the next axis, spread down onto single cells
+    for level in range(len(blocks) - 1, 0, -1):
+        half = 1 << (level - 1)
+        np.maximum(blocks[level - 1], blocks[level], out=blocks[level - 1])
+        np.maximum(blocks[level - 1][half:], blocks[level][:-half], out=blocks[level - 1][half:])
+    return blocks[0]
+
+def sparse(grid, count):
+    # table[level][i] = grid[i:i + 2**level].min() along the first axis, for `count` levels
+    table = np.empty((count,) + grid.shape, dtype=grid.dtype)
+    table[0] = grid
+    for level in range(1, count):
+        half = 1 << (level - 1)
+        table[level] = table[level - 1]
+        np.minimum(table[level - 1][:-half], table[level - 1][half:], out=table[level][:-half])
+    return table
+
+def painted_cells(drawn, corner):
+    # which cells a stamp, `drawn` pixels & its corner `corner` px into a cell, paints over completely
+    w, h = drawn.shape
+    grid = np.zeros((-(-(corner[0] + w) // CELL) * CELL, -(-(corner[1] + h) // CELL) * CELL), dtype=bool)
+    grid[corner[0]:corner[0] + w, corner[1]:corner[1] + h] = drawn
+    return grid.reshape(grid.shape[0] // CELL, CELL, grid.shape[1] // CELL, CELL).all(axis=(1, 3))
+
+def summed(grid):
+    # summed area table, table[x, y] = grid[:x, :y].sum()
+    table = np.zeros((grid.shape[0] + 1, grid.shape[1] + 1), dtype=int)
+    table[1:, 1:] = grid.cumsum(0).cumsum(1)
+    return table
+
+def windows(table, w, h):
+    # sum of every w x h window of a summed area table's grid, by its top left cell
+    return table[w:, h:] - table[:-w, h:] - table[w:, :-h] + table[:-w, :-h]
+
+def power_blocks(cells, count):
+    """Up to `count` blocks of 2**level cells a side, (x, y, level x, level y), inside `cells`.
+
+    Picked greedily, each covering the most cells the ones before left.
+    """
+    sizes = [(level_x, level_y) for level_x in range(int(levels(max(cells.shape[0], 1))) + 1)
+             for level_y in range(int(levels(max(cells.shape[1], 1))) + 1)]
+    painted = summed(cells)
+    inside = {size: windows(painted, 1 << size[0], 1 << size[1]) == 1 << sum(size) for size in sizes}
+    blocks, left = [], cells.copy()
+    for _ in range(count):
+        best, table = (0, None), summed(left)
+        for (level_x, level_y), fits in inside.items():
+            gain = np.where(fits, windows(table, 1 << level_x, 1 << level_y), 0)
+            x, y = np.unravel_index(gain.argmax(), gain.shape)
+            if gain[x, y] > best[0]:
+                best = gain[x, y], (int(x), int(y), level_x, level_y)
+        if not best[1]:
+            break
+        x, y, level_x, level_y = best[1]
+        left[x:x + (1 << level_x), y:y + (1 << level_y)] = False
+        blocks.append(best[1])
+    return blocks
+
+class ParticleSystem:
+    """Every particle as a slot of fixed size arrays, grown when full.
+
+    `free` holds the slots of dead particles to be reused by emit(), live
+    slots have `alive` set. Circles are stamped, shadow & all, from surfaces
+    drawn once per radius & colour, the same pixels pygame.draw.circle would draw.
+    """
+    def __init__(self, tile_size, capacity=256):
         self.tile_size = tile_size
-        self.angle = angle # the angle which bullet went
-
-        self.vel = vec2(1, 0).rotate(self.angle).normalize() * 4
-
-        self.radius = random.randint(self.tile_size//2, self.tile_size)
-        self.color = random.choice(['#5e3ea8', '#7a56c8', '#a97dff'])
-    
-    def draw(self, draw_surf, camera_offset):
-        render_x = self.pos[0] - camera_offset[0]
-        render_y = self.pos[1] - camera_offset[1]
-        
-        pygame.draw.circle(draw_surf, (10, 10, 10), (render_x, render_y + 2), self.radius)
-        pygame.draw.circle(draw_surf, self.color, (render_x, render_y), self.radius)
-    
-    def update(self, delta_time):
-        self.dt = delta_time
+        self.capacity = 0
+        self.pos = np.zeros((0, 2))
+        self.vel = np.zeros((0, 2))
+        self.radius = np.zeros(0)
+        self.color = np.zeros(0, dtype=np.uint8)
+        self.alive = np.zeros(0, dtype=bool)
+        self.free = []
+        self.grow(capacity)
 
-        self.vel.x += (0 - self.vel.x) * 0.3 * self.dt
-        self.vel.y += (0 - self.vel.y) * 0.3 * self.dt
+        # stamps[color, drop - 1, radius], a circle over its shadow `drop` px below, colour keyed & RLE encoded since
+        # those blit fastest. The shadow's drop is 1 px where truncating its centre & the particle's rounds differently
+        circles = {}
+        for color in COLORS + [SHADOW]:
+            for radius in range(1, self.tile_size + 1):
+                circles[color, radius] = pygame.Surface((radius * 2, radius * 2)).convert()
+                circles[color, radius].fill(KEY)
+                pygame.draw.circle(circles[color, radius], color, (radius, radius), radius)
+                circles[color, radius].set_colorkey(KEY)
+        self.stamps = np.empty((len(COLORS), 2, self.tile_size + 1), dtype=object)
+        for index, color in enumerate(COLORS):
+            for radius in range(1, self.tile_size + 1):
+                for drop in (1, 2):
+                    stamp = pygame.Surface((radius * 2, radius * 2 + drop)).convert()
+                    stamp.fill(KEY)
+                    stamp.blits([(circles[SHADOW, radius], (0, drop)), (circles[color, radius], (0, 0))])
+                    stamp.set_colorkey(KEY, pygame.RLEACCEL)
+                    self.stamps[index, drop - 1, radius] = stamp
+        # per ((radius * 2 + drop - 1) * CELL + y % CELL) * CELL + x % CELL of a stamp's corner, the blocks of cells it
+        # paints over, marks[block] = (x, y, level x, level y) from its corner's cell, & the box of cells it touches,
+        # box = (level x, level y, step x, step y), 2 overlapping power of two blocks a side. See visible()
+        keys = (self.tile_size + 1) * 2 * CELL * CELL
+        self.marks = np.zeros((MARKS, keys, 4), dtype=np.int64)
+        self.marks[..., 2:] = -1
+        self.box = np.zeros((keys, 4), dtype=np.int64)
+        picked = {} # most corners of neighbouring radii paint the same cells
+        for radius in range(1, self.tile_size + 1):
+            for drop in (1, 2):
+                drawn = pygame.surfarray.array_colorkey(self.stamps[0, drop - 1, radius]) > 0
+                for y in range(CELL):
+                    for x in range(CELL):
+                        key = ((radius * 2 + drop - 1) * CELL + y) * CELL + x
+                        cells = painted_cells(drawn, (x, y))
+                        if (cells.shape, cells.tobytes()) not in picked:
+                            picked[cells.shape, cells.tobytes()] = power_blocks(cells, MARKS)
+                        blocks = picked[cells.shape, cells.tobytes()]
+                        if blocks:
+                            self.marks[:len(blocks), key] = blocks
+                        count = (np.array([x + radius * 2, y + radius * 2 + drop]) + CELL - 1) >> SHIFT
+                        self.box[key] = *levels(count), *(count - (1 << levels(count)))
+        self.levels = int(self.marks[..., 2:].max()) + 1
+        self.pad = (self.tile_size * 2 + 2) // CELL + 2 # cells around the screen a box on it can reach
 
-        self.pos[0] += self.vel.x * self.dt
-        self.pos[1] += self.vel.y * self.dt
+    def __len__(self):
+        return self.capacity - len(self.free)
+
+    def grow(self, capacity):
+        added = capacity - self.capacity
+        self.pos = np.concatenate([self.pos, np.zeros((added, 2))])
+        self.vel = np.concatenate([self.vel, np.zeros((added, 2))])
+        self.radius = np.concatenate([self.radius, np.zeros(added)])
+        self.color = np.concatenate([self.color, np.zeros(added, dtype=np.uint8)])
+        self.alive = np.concatenate([self.alive, np.zeros(added, dtype=bool)])
+        # popped from the end, so the lowest slots fill first
+        self.free += range(capacity - 1, self.capacity - 1, -1)
+        self.capacity = capacity
+
+    def emit(self, pos, angle):
+        """A particle at `pos` flying off along `angle` (degrees)."""
+        if not self.free:
+            self.grow(self.capacity * 2)
+        slot = self.free.pop()
+        self.pos[slot] = pos
+        self.vel[slot] = math.cos(math.radians(angle)) * 4, math.sin(math.radians(angle)) * 4
+        self.radius[slot] = random.randint(self.tile_size//2, self.tile_size)
+        self.color[slot] = random.randrange(len(COLORS))
+        self.alive[slot] = True
+
+    def emit_many(self, positions, angles):
+        """emit() for every position & angle at once."""
+        count = len(angles)
+        if not count:
+            return
+        while len(self.free) < count:
+            self.grow(self.capacity * 2)
+        slots = np.array(self.free[-count:][::-1])
+        del self.free[-count:]
+
+        angles = np.radians(angles)
+        self.pos[slots] = positions
+        self.vel[slots] = np.stack([np.cos(angles) * 4, np.sin(angles) * 4], axis=1)
+        looks = np.array([(random.randint(self.tile_size//2, self.tile_size), random.randrange(len(COLORS))) for _ in range(count)])
+        self.radius[slots], self.color[slots] = looks[:, 0], looks[:, 1]
+        self.alive[slots] = True
+
+    def visible(self, size, x, y, shadow_y, radius):
+        """Which particles, corners (x, y) & shadows' (x, shadow_y) px in draw order, later ones paint over completely.
+
+        Cells of CELL px a particle & its shadow paint over together are marked
+        with its index, as MARKS power of two blocks folded down to cells. A
+        particle is hidden when every cell its box touches was marked by a
+        later one. Cells off the screen count as marked by a later one, so off
+        screen particles are always hidden.
+        """
+        w, h, pad = -(-size[0] // CELL), -(-size[1] // CELL), self.pad
+        width, height = w + pad * 2, h + pad * 2
+        key = ((radius * 2 + shadow_y - y - 1) * CELL + (y & (CELL - 1))) * CELL + (x & (CELL - 1))
+        # far off screen ones are moved to the edge of the padding, they only ever touch padding cells
+        cx, cy = (x >> SHIFT).clip(-pad, w) + pad, (y >> SHIFT).clip(-pad, h) + pad
+        index = np.arange(len(x), dtype=np.int32)
+
+        # blocks[level x * levels + level y], missing blocks of stamps painting fewer go to the extra last one
+        count = self.levels
+        blocks = np.full((count * count + 1, width, height), -1, dtype=np.int32)
+        cell = cx * height + cy
+        for x0, y0, level_x, level_y in self.marks.transpose(0, 2, 1):
+            level = np.where(level_x < 0, count * count, level_x * count + level_y)
+            np.maximum.at(blocks.reshape(-1), ((level * width + x0) * height + y0)[key] + cell, index)
+        blocks = blocks[:-1].reshape(count, count, width, height)
+        cover = fold(fold(np.moveaxis(blocks, 2, 1)).transpose(1, 2, 0)).T
+        for edge in (np.s_[:pad], np.s_[pad + w:], np.s_[:, :pad], np.s_[:, pad + h:]):
+            cover[edge] = np.iinfo(np.int32).max
+
+        level_x, level_y, back_x, back_y = self.box.T
+        lx, ly = int(level_x.max()) + 1, int(level_y.max()) + 1
+        table = sparse(sparse(cover, lx).transpose(2, 0, 1), ly).reshape(-1) # (y levels, height, x levels, width)
+        corner = (level_x * width + level_y * height * lx * width)[key] + cy * (lx * width) + cx
+        right, below = back_x[key], (back_y * lx * width)[key]
+        least = np.minimum(np.minimum(table[corner], table[corner + right]),
+                           np.minimum(table[corner + below], table[corner + right + below]))
+        return least <= index
+
+    def draw(self, draw_surf, camera_offset, view=None):
+        slots = np.flatnonzero(self.alive)
+        if view:
+            area = view.area(self.tile_size)
+            x, y = self.pos[slots, 0], self.pos[slots, 1]
+            slots = slots[(x > area.left) & (x < area.right) & (y > area.top) & (y < area.bottom)]
+        if not len(slots):
+            return []
+
+        # like draw.circle, centres & radii are truncated
+        radius = self.radius[slots].astype(np.int64)
+        x = np.trunc(self.pos[slots, 0] - camera_offset[0]).astype(np.int64) - radius
+        y = np.trunc(self.pos[slots, 1] - camera_offset[1]).astype(np.int64) - radius
+        shadow_y = np.trunc(self.pos[slots, 1] - camera_offset[1] + 2).astype(np.int64) - radius
+
+        size = draw_surf.get_size()
+        drawn = np.arange(len(slots))
+        if (radius ** 2).sum() * 4 > OVERDRAW * size[0] * size[1]:
+            drawn = np.flatnonzero(self.visible(size, x, y, shadow_y, radius))
+        # taken from the flattened stamps, indexing with 3 arrays is slow for objects
+        stamp = np.ravel_multi_index((self.color[slots[drawn]], (shadow_y - y - 1)[drawn], radius[drawn]), self.stamps.shape)
+        stamps = self.stamps.reshape(-1).take(stamp)
+        draw_surf.blits(zip(stamps.tolist(), zip(x[drawn].tolist(), y[drawn].tolist())), doreturn=False)
+        # one rect around all of them, bursts stay close together
+        right, bottom = (x + radius * 2).max(), (y + radius * 2 + 2).max()
+        return [pygame.Rect(x.min(), y.min(), right - x.min(), bottom - y.min())]
+
+    def update(self, delta_time):
+        # dead slots are stepped too, cheaper than picking out the live ones & emit() resets them
+        self.vel += (0 - self.vel) * 0.3 * delta_time
+        self.pos += self.vel * delta_time
+        self.radius -= 0.5 * delta_time
 
-        self.radius -= 0.5 * self.dt
-        if self.radius < 1:
-            return True
-        return
+        dead = np.flatnonzero(self.alive & (self.radius < 1))
+        if len(dead):
+            self.alive[dead] = False
+            self.free += dead[::-1].tolist()
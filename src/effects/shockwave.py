@@ -1,29 +1,56 @@
 # effects/shockwave.py — expanding ring visual effect
-# Creates radial shockwave on explosions or player death
-# Draws fading circle until width approaches zero
+# Creates radial shockwaves on explosions or player death, fading until the width approaches zero
+# Every ring is kept in NumPy arrays & drawn from pre-rendered ring stamps shared by all of them
+from functools import lru_cache
+
+import numpy as np
 import pygame
 
-class Shockwave:
-    def __init__(self, pos, tile_size):
-        self.pos = pos
+SHADOW = (10, 10, 10)
+COLOR = '#a97dff'
+KEY = (255, 0, 255) # transparent in ring stamps
+
+@lru_cache(maxsize=1024)
+def ring(radius, width, color):
+    """What pygame.draw.circle draws for a whole `radius` & `width`, centred on (radius, radius)."""
+    stamp = pygame.Surface((radius * 2, radius * 2)).convert()
+    stamp.fill(KEY)
+    pygame.draw.circle(stamp, color, (radius, radius), radius, width)
+    stamp.set_colorkey(KEY, pygame.RLEACCEL)
+    return stamp
+
+class ShockwaveManager:
+    def __init__(self, tile_size):
         self.tile_size = tile_size
+        self.pos = np.zeros((0, 2))
+        self.radius = np.zeros(0)
+        self.width = np.zeros(0)
 
-        self.radius = 0
-        self.width = 4
-    
-    def draw(self, draw_surf, camera_offset):
-        render_x = self.pos[0] - camera_offset[0]
-        render_y = self.pos[1] - camera_offset[1]
+    def __len__(self):
+        return len(self.radius)
 
-        pygame.draw.circle(draw_surf, (10, 10, 10), (render_x, render_y + 2), self.radius, int(self.width))
-        pygame.draw.circle(draw_surf, '#a97dff', (render_x, render_y), self.radius, int(self.width))
+    def add(self, pos):
+        self.pos = np.concatenate([self.pos, [pos]])
+        self.radius = np.append(self.radius, 0)
+        self.width = np.append(self.width, 4)
+
+    def draw(self, draw_surf, camera_offset, view=None):
+        # draw.circle truncates the radius & width as well, so the stamps look the same
+        blits = []
+        for (x, y), radius, width in zip(self.pos.tolist(), self.radius.astype(np.int64).tolist(), self.width.astype(np.int64).tolist()):
+            if radius < 1 or (view and not view.sees((x - radius, y - radius, radius * 2, radius * 2 + 2))):
+                continue
+            left, top = int(x - camera_offset[0]) - radius, int(y - camera_offset[1]) - radius
+            blits.append((ring(radius, width, SHADOW), (left, int(y - camera_offset[1] + 2) - radius)))
+            blits.append((ring(radius, width, COLOR), (left, top)))
+        draw_surf.blits(blits, doreturn=False)
+        return [(left, top, stamp.get_width(), stamp.get_height() + 2) for stamp, (left, top) in blits[1::2]]
 
     def update(self, delta_time):
-        self.dt = delta_time
-
-        self.radius += (self.tile_size * 4 - self.radius) * 0.1 * self.dt
-        if round(self.radius) >= self.tile_size * 4:
-            self.width += (0 - self.width) * 0.5 * self.dt
-            if self.width < 1:
-                return True
-        return
\ No newline at end of file
+        self.radius += (self.tile_size * 4 - self.radius) * 0.1 * delta_time
+        grown = np.round(self.radius) >= self.tile_size * 4
+        self.width[grown] += (0 - self.width[grown]) * 0.5 * delta_time
+
+        faded = grown & (self.width < 1)
+        if faded.any():
+            self.pos, self.radius, self.width = self.pos[~faded], self.radius[~faded], self.width[~faded]
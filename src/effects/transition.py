@@ -0,0 +1,135 @@
+# effects/transition.py — screen transitions covering everything outside an opening shape
+# Outside the shape's bounding box the screen is covered with plain fills, inside it with pre-rendered stamps
+# Stamps are the colour keyed & RLE encoded corners left covered, kept per quantized size, a frame costs a few fills & blits
+# The stamp a step wider than the opening is used & a drawn edge covers the rest, so it still grows a pixel at a time
+from abc import ABC, abstractmethod
+
+import pygame
+
+KEY = (255, 0, 255) # the opening in stamps
+
+class Transition(ABC):
+    """Covers `size` with `color` except for an opening `amount` px big."""
+    def __init__(self, size, color):
+        self.size = tuple(size)
+        self.color = color
+
+    @abstractmethod
+    def draw(self, draw_surf, amount):
+        """Cover `draw_surf`, leaving an opening `amount` px big."""
+
+    def covered(self, amount):
+        """Whether draw() covers the whole screen."""
+        return amount <= 0
+
+class IrisTransition(Transition):
+    """Opens a shape around `center` (the middle by default), reaching `amount` px out from it.
+
+    Subclasses draw the shape with shape(), its rim with edge() & say in
+    opened() when it covers the whole screen. Stamps are built per `step` px
+    the first time they're needed, so there are never more than the screen's
+    half diagonal / step sets of them. Amounts between steps use the next
+    step's stamp & edge() covers the gap, up to 2 px into the opening.
+    """
+    def __init__(self, size, color, center=None, step=8):
+        super().__init__(size, color)
+        self.center = center or (self.size[0] // 2, self.size[1] // 2)
+        self.step = step
+        self.screen = pygame.Rect((0, 0), self.size)
+        self.stamps = {} # amount -> (screen area, pieces)
+
+    @abstractmethod
+    def shape(self, surf, center, amount):
+        """Draw the opening in KEY on `surf`, `amount` px out from `center`."""
+
+    @abstractmethod
+    def edge(self, surf, center, amount, outer):
+        """Cover between `amount` & `outer` px out from `center`, holes in it would show."""
+
+    @abstractmethod
+    def opened(self, amount):
+        """Whether the opening covers the whole screen."""
+
+    def stamp(self, amount):
+        """Bounding box of the shape on screen & the covered pieces of it as (stamp, screen position)."""
+        if amount not in self.stamps:
+            area = pygame.Rect(self.center[0] - amount, self.center[1] - amount, amount * 2, amount * 2).clip(self.screen)
+            full = pygame.Surface(area.size).convert()
+            full.fill(self.color)
+            self.shape(full, (self.center[0] - area.x, self.center[1] - area.y), amount)
+            full.set_colorkey(KEY)
+
+            # only what's left covered in each quarter is kept, mostly small corners
+            pieces = []
+            cx, cy = self.center[0] - area.x, self.center[1] - area.y
+            for quarter in ((0, 0, cx, cy), (cx, 0, area.w - cx, cy), (0, cy, cx, area.h - cy), (cx, cy, area.w - cx, area.h - cy)):
+                quarter = pygame.Rect(quarter).clip(full.get_rect())
+                if not quarter.w or not quarter.h:
+                    continue
+                covered = full.subsurface(quarter).get_bounding_rect().move(quarter.topleft)
+                if covered.w and covered.h:
+                    piece = full.subsurface(covered).copy()
+                    piece.set_colorkey(KEY, pygame.RLEACCEL)
+                    pieces.append((piece, covered.move(area.topleft).topleft))
+            self.stamps[amount] = area, pieces
+        return self.stamps[amount]
+
+    def draw(self, draw_surf, amount):
+        amount = int(amount)
+        if amount <= 0:
+            draw_surf.fill(self.color, self.screen)
+            return
+        if self.opened(amount):
+            return
+
+        stamped = -(-amount // self.step) * self.step
+        area, pieces = self.stamp(stamped)
+        w, h = self.size
+        for band in ((0, 0, w, area.top), (0, area.bottom, w, h - area.bottom), (0, area.top, area.left, area.h), (area.right, area.top, w - area.right, area.h)):
+            if band[2] > 0 and band[3] > 0:
+                draw_surf.fill(self.color, band)
+        draw_surf.blits(pieces, doreturn=False)
+        if stamped > amount:
+            self.edge(draw_surf, self.center, amount, stamped)
+
+    def covered(self, amount):
+        return int(amount) <= 0
+
+    def corner(self):
+        # offset of the screen corner furthest from the centre
+        return max(self.center[0], self.size[0] - self.center[0]), max(self.center[1], self.size[1] - self.center[1])
+
+class CircleTransition(IrisTransition):
+    def shape(self, surf, center, amount):
+        pygame.draw.circle(surf, KEY, center, amount)
+
+    def edge(self, surf, center, amount, outer):
+        # a px thicker than the gap, a thick circle leaves holes between its rings otherwise
+        pygame.draw.circle(surf, self.color, center, outer, outer - amount + 1)
+
+    def opened(self, amount):
+        dx, dy = self.corner()
+        return dx * dx + dy * dy < amount * amount
+
+class DiamondTransition(IrisTransition):
+    def shape(self, surf, center, amount):
+        x, y = center
+        pygame.draw.polygon(surf, KEY, ((x, y - amount), (x + amount, y), (x, y + amount), (x - amount, y)))
+
+    def edge(self, surf, center, amount, outer):
+        # a trapezoid per side, from a px inside the opening so neighbouring ones leave no gaps
+        x, y = center
+        inner = amount - 1
+        for dx, dy in ((1, 1), (1, -1), (-1, -1), (-1, 1)):
+            pygame.draw.polygon(surf, self.color, ((x, y + dy * outer), (x + dx * outer, y), (x + dx * inner, y), (x, y + dy * inner)))
+
+    def opened(self, amount):
+        dx, dy = self.corner()
+        return dx + dy < amount
+
+class WipeTransition(Transition):
+    """Opens from the left edge to the right, a single fill."""
+    def draw(self, draw_surf, amount):
+        x = max(int(amount), 0)
+        if x < self.size[0]:
+            draw_surf.fill(self.color, (x, 0, self.size[0] - x, self.size[1]))
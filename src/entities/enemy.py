@@ -2,16 +2,26 @@
 # Defines Enemy behavior (pursuit, dash, damage) and EnemyManager spawning/updating
 # Integrates with bullets for combat interactions
 import random, pygame
+from functools import lru_cache
+from pygame.math import Vector2 as vec2
 
 from src.entities.entity import Entity
 
-from src.utilities.utils import get_offset
+from src.utilities.spatial_hash import SpatialHash
+from src.utilities.scheduler import UpdateScheduler
+
+@lru_cache(maxsize=4)
+def enemy_image(tile_size):
+    # shared by every enemy, so their squashed & flickering frames are cached once for all of them
+    image = pygame.Surface((tile_size, tile_size)).convert_alpha()
+    image.fill('#e9e3d9')
+    return image
 
 class Enemy(Entity):
     def __init__(self, tile_size, pos, damage=1, health=3, dash_speed=6):
         super().__init__(tile_size, pos)
         
-        self.image.fill('#e9e3d9')
+        self.image = enemy_image(tile_size)
 
         self.pursued = False
         self.purse_range = self.tile_size * 7
@@ -27,6 +37,9 @@ class Enemy(Entity):
         self.flicker_timer = 0
         self.dash_timer = 8
         self.dash_cooldown_timer = random.randint(0, self.cooldown)
+
+        self.lod_phase = 0 # which frames a far away enemy steps on, see UpdateScheduler
+        self.lod_elapsed = 0 # time since it last stepped
     
     def bullet_collision(self, bullets):
         for bullet in bullets:
@@ -34,9 +47,11 @@ class Enemy(Entity):
                 self.health -= bullet.damage
                 return True
 
-    def pursue_target(self, entity):
+    def pursue_target(self, entity, nearby=True):
         self.vel.x = 0
         self.vel.y = 0
+        if not nearby: # the broadphase already ruled it out
+            return
 
         dx = entity.x - self.x
         dy = entity.y - self.y
@@ -49,7 +64,7 @@ class Enemy(Entity):
         self.pursued = True
         self.scale(0.5, 1.5)
     
-    def chase(self, entity):
+    def chase(self, entity, flow=None):
         dx = entity.x - self.rect.x
         dy = entity.y - self.rect.y
 
@@ -58,43 +73,35 @@ class Enemy(Entity):
             self.dash_cooldown_timer -= self.dt
             if self.dash_cooldown_timer < 0:
                 angle = random.randint(1, 45)
-                self.vel.x = dx
-                self.vel.y = dy
+                # around the terrain along the flow field, straight at the target where it has no way
+                direction = flow.direction(self.rect.center) if flow else None
+                self.vel = direction if direction is not None else vec2(dx, dy)
                 self.vel = self.vel.rotate(random.choice([0, angle, -angle]))
                 self.dash_cooldown_timer = self.cooldown
                 self.dash_timer = 6
                 self.scale(0.6, 1.4)
                 return
 
-    def move(self, tiles):
+    def move(self, grid):
         if self.vel.length() > 0:
             self.vel = self.vel.normalize()
 
         if self.dash_timer > 0:
-            self.speed += (self.dash_speed - self.speed) * self.dt
+            self.speed += (self.dash_speed - self.speed) * (min(self.dt, 1) if self.long_step else self.dt)
         else:
-            self.speed += (0 - self.speed) * 0.5 * self.dt
+            self.speed += (0 - self.speed) * (min(0.5 * self.dt, 1) if self.long_step else 0.5 * self.dt)
         self.total_vel = self.vel * self.speed + self.ext_vel
+        self.travel(grid)
 
-        self.y += self.total_vel.y * self.dt
-        self.rect.y = self.y
-        self.vertical_collision(tiles)
-        self.rect.y = self.y
-
-        self.x += self.total_vel.x * self.dt
-        self.rect.x = self.x
-        self.horizontal_collision(tiles)
-        self.rect.x = self.x
-
-    def update(self, delta_time, player):
-        super().update(delta_time)
+    def update(self, delta_time, player, nearby=True, flow=None, long_step=False):
+        super().update(delta_time, long_step)
 
         if self.pursued == False:
-            self.pursue_target(player)
+            self.pursue_target(player, nearby)
         else:
             self.process_timer -= self.dt
             if self.process_timer < 0:
-                self.chase(player)
+                self.chase(player, flow)
 
 
 class EnemyManager:
@@ -109,6 +116,11 @@ class EnemyManager:
         self.spawn_cooldown = 180
         self.spawn_cooldown_timer = 180
 
+        self.grid = SpatialHash(self.tile_size * 2) # rebuilt every tick, see update & Game.entities_collisions
+        # enemies far from the view step less often, spread over frames by spawn order
+        self.scheduler = UpdateScheduler(self.tile_size)
+        self.spawned = 0
+
     def can_spawn(self):
         self.spawn_cooldown_timer -= self.dt
         if self.spawn_cooldown_timer < 0:
@@ -116,27 +128,30 @@ class EnemyManager:
         return
 
     def spawn(self, pos):
-        self.enemies.append(Enemy(self.tile_size, pos, random.choice(self.damages), random.choice(self.healths), random.choice(self.dash_speed)))
+        enemy = Enemy(self.tile_size, pos, random.choice(self.damages), random.choice(self.healths), random.choice(self.dash_speed))
+        enemy.lod_phase = self.spawned
+        self.spawned += 1
+        self.enemies.append(enemy)
     
-    def draw(self, draw_surf, camera_offset):
-        for enemy in self.enemies:
-            enemy.draw(draw_surf, camera_offset)
-
-    def update(self, delta_time, player, ground_tiles, tiles):
+    def draw(self, draw_surf, camera_offset, view=None):
+        # margin leaves room for shadows & squash outside the hitbox
+        rects = []
+        for enemy in view.entities(self.enemies, self.tile_size * 2) if view else self.enemies:
+            rects += enemy.draw(draw_surf, camera_offset)
+        return rects
+
+    def update(self, delta_time, player, blocking, flow=None, view=None):
         self.dt = delta_time
+        # enemies close enough to notice the player, before anyone moves this tick
+        self.grid.build(self.enemies)
+        near = set(self.grid.nearby((player.x, player.y), max((enemy.purse_range for enemy in self.enemies), default=0)))
+        self.scheduler.begin(view)
         for enemy in self.enemies:
-            enemy.update(delta_time, player)
-
-            enemy_offset = get_offset(enemy, [self.tile_size]*2)
-            collide_tiles = []
-            for offset in [(-1, 0), (0, -1), (1, 0), (0, 1), (-1, -1), (1, -1), (-1, 1), (1, 1)]:
-                tile_offset = (enemy_offset[0] + offset[0], enemy_offset[1] + offset[1])
-                if tile_offset in ground_tiles:
-                    collide_tiles.append(ground_tiles[tile_offset]) if ground_tiles[tile_offset].tile_type in ['air', 'edge'] else None
-                if tile_offset in tiles:
-                    collide_tiles.append(tiles[tile_offset]) if tiles[tile_offset].tile_type not in ['air', 'edge'] else None
-            
-            enemy.move(collide_tiles)
+            enemy.lod_elapsed += delta_time
+            if self.scheduler.due(self.scheduler.tier(enemy.rect), enemy.lod_phase):
+                enemy.update(enemy.lod_elapsed, player, enemy in near, flow, enemy.lod_elapsed > delta_time)
+                enemy.move(blocking)
+                enemy.lod_elapsed = 0
 
             # make all the enemies pursued
             if enemy.pursued:
@@ -0,0 +1,252 @@
+# entities/enemy_batch.py — struct of arrays enemy simulation
+# EnemyBatch keeps every enemy's state in NumPy columns, BatchedEnemyManager steps them all at once per tick
+# BatchedEnemy is an Enemy whose attributes read & write its row, so drawing & Game collisions don't change
+import random
+import pygame
+from pygame.math import Vector2 as vec2
+
+import numpy as np
+
+from src.entities.entity import Entity
+from src.entities.enemy import Enemy, EnemyManager, enemy_image
+from src.tiling.collision import blocks_row_many, blocks_column_many
+
+def rect_coords(values):
+    # pygame rounds float Rect coordinates half away from zero
+    return np.trunc(values + np.copysign(0.5, values)).astype(np.int64)
+
+class EnemyBatch:
+    """Enemy state as columns, row i is the i-th enemy of the manager's list."""
+    FIELDS = (
+        ('x', np.float64), ('y', np.float64), ('rect_x', np.int64), ('rect_y', np.int64),
+        ('vel_x', np.float64), ('vel_y', np.float64), ('ext_x', np.float64), ('ext_y', np.float64),
+        ('total_x', np.float64), ('total_y', np.float64), ('speed', np.float64), ('dash_speed', np.float64),
+        ('scale_x', np.float64), ('scale_y', np.float64), ('health', np.float64), ('damage', np.int64),
+        ('process_timer', np.float64), ('flicker_timer', np.float64), ('damage_timer', np.float64),
+        ('dash_timer', np.float64), ('dash_cooldown_timer', np.float64), ('pursued', np.bool_),
+        ('lod_phase', np.int64), ('lod_elapsed', np.float64),
+    )
+
+    def __init__(self, capacity=16):
+        self.count = 0
+        self.capacity = capacity
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def add(self, **values):
+        """Append a row, fields left out start at zero. Returns its index."""
+        if self.count == self.capacity:
+            self.capacity *= 2
+            for name, _ in self.FIELDS:
+                column = getattr(self, name)
+                setattr(self, name, np.concatenate([column, np.zeros_like(column)]))
+        index = self.count
+        for name, value in values.items():
+            getattr(self, name)[index] = value
+        self.count += 1
+        return index
+
+    def take(self, indices):
+        """A new batch holding rows `indices` in that order."""
+        batch = EnemyBatch(max(len(indices), 1))
+        for name, _ in self.FIELDS:
+            getattr(batch, name)[:len(indices)] = getattr(self, name)[indices]
+        batch.count = len(indices)
+        return batch
+
+class Column:
+    # attribute of a BatchedEnemy stored in its batch row
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, enemy, owner=None):
+        if enemy is None:
+            return self
+        return getattr(enemy.batch, self.name)[enemy.index].item()
+
+    def __set__(self, enemy, value):
+        getattr(enemy.batch, self.name)[enemy.index] = value
+
+class VectorColumn:
+    # reads are copies, assign a whole vector to change it
+    def __init__(self, x_name, y_name):
+        self.x_name, self.y_name = x_name, y_name
+
+    def __get__(self, enemy, owner=None):
+        if enemy is None:
+            return self
+        return vec2(getattr(enemy.batch, self.x_name)[enemy.index], getattr(enemy.batch, self.y_name)[enemy.index])
+
+    def __set__(self, enemy, value):
+        getattr(enemy.batch, self.x_name)[enemy.index] = value[0]
+        getattr(enemy.batch, self.y_name)[enemy.index] = value[1]
+
+class BatchedEnemy(Enemy):
+    """An Enemy backed by a row of an EnemyBatch, stepped by BatchedEnemyManager instead of update() & move()."""
+    x, y = Column('x'), Column('y')
+    vel, ext_vel, total_vel = VectorColumn('vel_x', 'vel_y'), VectorColumn('ext_x', 'ext_y'), VectorColumn('total_x', 'total_y')
+    speed, dash_speed = Column('speed'), Column('dash_speed')
+    scale_x, scale_y = Column('scale_x'), Column('scale_y')
+    health, damage = Column('health'), Column('damage')
+    process_timer, flicker_timer, damage_timer = Column('process_timer'), Column('flicker_timer'), Column('damage_timer')
+    dash_timer, dash_cooldown_timer = Column('dash_timer'), Column('dash_cooldown_timer')
+    pursued = Column('pursued')
+    lod_phase, lod_elapsed = Column('lod_phase'), Column('lod_elapsed')
+
+    def __init__(self, batch, index, tile_size, image, shadow):
+        # no Entity.__init__, every enemy shares the same image & shadow
+        self.batch = batch
+        self.index = index
+        self.tile_size = tile_size
+        self.image = image
+        self.shadow = shadow
+        self.ori_pos = self.x, self.y
+
+        self.purse_range = self.tile_size * 7
+        self.cooldown = 60
+        self.damage_taken_cooldown = 15
+        self.dt = 1
+
+    @property
+    def rect(self):
+        return pygame.Rect(self.batch.rect_x[self.index].item(), self.batch.rect_y[self.index].item(), self.tile_size, self.tile_size)
+
+class BatchedEnemyManager(EnemyManager):
+    """EnemyManager stepping every enemy with array operations.
+
+    `enemies` is still a list of Enemy views in spawn order, assigning a
+    filtered list (like Game does for dead enemies) drops their rows.
+    Only dash triggers run per enemy in Python, in list order, so random
+    numbers are drawn exactly like EnemyManager draws them.
+    """
+    def __init__(self, tile_size):
+        self.batch = EnemyBatch()
+        self._enemies = []
+        super().__init__(tile_size)
+
+        # what Enemy.__init__ sets up, without its random draw
+        template = Entity(tile_size, (0, 0))
+        self.image, self.shadow = enemy_image(tile_size), template.shadow
+        self.purse_range = self.tile_size * 7
+        self.cooldown = 60
+
+    @property
+    def enemies(self):
+        return self._enemies
+
+    @enemies.setter
+    def enemies(self, enemies):
+        enemies = list(enemies)
+        kept = {id(enemy) for enemy in enemies}
+        for enemy in self._enemies:
+            if id(enemy) not in kept: # removed enemies keep a copy of their last state
+                enemy.batch, enemy.index = self.batch.take([enemy.index]), 0
+        self.batch = self.batch.take([enemy.index for enemy in enemies])
+        for index, enemy in enumerate(enemies):
+            enemy.batch, enemy.index = self.batch, index
+        self._enemies = enemies
+
+    def spawn(self, pos):
+        # same random draws in the same order as Enemy.__init__
+        damage, health, dash_speed = random.choice(self.damages), random.choice(self.healths), random.choice(self.dash_speed)
+        x, y = pos[0] * self.tile_size, pos[1] * self.tile_size
+        index = self.batch.add(x=x, y=y, rect_x=x, rect_y=y, dash_speed=dash_speed, scale_x=1.0, scale_y=1.0, health=health, damage=damage,
+                               process_timer=24, dash_timer=8, dash_cooldown_timer=random.randint(0, self.cooldown), lod_phase=self.spawned)
+        self.spawned += 1
+        self._enemies.append(BatchedEnemy(self.batch, index, self.tile_size, self.image, self.shadow))
+
+    def update(self, delta_time, player, blocking, flow=None, view=None):
+        self.dt = delta_time
+        b, n, ts = self.batch, self.batch.count, self.tile_size
+        x, y, rect_x, rect_y = b.x[:n], b.y[:n], b.rect_x[:n], b.rect_y[:n]
+        vel_x, vel_y, ext_x, ext_y = b.vel_x[:n], b.vel_y[:n], b.ext_x[:n], b.ext_y[:n]
+        total_x, total_y, speed, pursued = b.total_x[:n], b.total_y[:n], b.speed[:n], b.pursued[:n]
+        scale_x, scale_y = b.scale_x[:n], b.scale_y[:n]
+
+        # the enemies due this frame step with the time since their last step, everyone else with 0
+        self.scheduler.begin(view)
+        due = self.scheduler.due(self.scheduler.tiers_of(rect_x, rect_y, rect_x + ts, rect_y + ts), b.lod_phase[:n])
+        b.lod_elapsed[:n] += delta_time
+        dt = np.where(due, b.lod_elapsed[:n], 0.0)
+        long_step = due & (b.lod_elapsed[:n] > delta_time) # skipped frames, see Entity.update
+        b.lod_elapsed[:n][due] = 0
+
+        # Entity.update: squash recovery, knockback decay & timers
+        scale_x += (1.0 - scale_x) * 0.1 * dt
+        scale_y += (1.0 - scale_y) * 0.1 * dt
+        decay = np.where(long_step, np.minimum(dt, 1), dt)
+        ext_x += (0 - ext_x) * decay
+        ext_y += (0 - ext_y) * decay
+        ext_x[np.abs(ext_x) < 0.001] = 0
+        ext_y[np.abs(ext_y) < 0.001] = 0
+        b.damage_timer[:n] -= dt
+        b.flicker_timer[:n] -= dt
+
+        # idle enemies wait for the player to come in range, pursuing ones count down to their next dash
+        idle = due & ~pursued
+        vel_x[idle] = 0
+        vel_y[idle] = 0
+        spotted = idle & (np.sqrt((player.x - x)**2 + (player.y - y)**2) < self.purse_range)
+        pursued[spotted] = True
+        scale_x[spotted], scale_y[spotted] = 0.5, 1.5
+
+        process_timer, dash_timer, dash_cooldown_timer = b.process_timer[:n], b.dash_timer[:n], b.dash_cooldown_timer[:n]
+        chasing = due & ~idle
+        process_timer[chasing] -= dt[chasing]
+        ready = chasing & (process_timer < 0)
+        dash_timer[ready] -= dt[ready]
+        cooling = ready & (dash_timer < 0)
+        dash_cooldown_timer[cooling] -= dt[cooling]
+
+        # the sparse part, dashes along the flow field (or straight at the player) with a random swerve
+        for index in np.flatnonzero(cooling & (dash_cooldown_timer < 0)).tolist():
+            angle = random.randint(1, 45)
+            direction = flow.direction((rect_x[index].item() + ts // 2, rect_y[index].item() + ts // 2)) if flow else None
+            if direction is None:
+                direction = vec2(player.x - rect_x[index].item(), player.y - rect_y[index].item())
+            vel = direction.rotate(random.choice([0, angle, -angle]))
+            vel_x[index], vel_y[index] = vel.x, vel.y
+            dash_cooldown_timer[index] = self.cooldown
+            dash_timer[index] = 6
+            scale_x[index], scale_y[index] = 0.6, 1.4
+
+        # Enemy.move: dash speed easing, then per axis collision against the blocking grid
+        length = np.sqrt(vel_x * vel_x + vel_y * vel_y)
+        moving = due & (length > 0)
+        vel_x[moving] /= length[moving]
+        vel_y[moving] /= length[moving]
+        dashing = due & (dash_timer > 0)
+        easing = due & ~dashing
+        speed[dashing] += (b.dash_speed[:n][dashing] - speed[dashing]) * np.where(long_step, np.minimum(dt, 1), dt)[dashing]
+        speed[easing] += (0 - speed[easing]) * np.where(long_step, np.minimum(0.5 * dt, 1), 0.5 * dt)[easing]
+        total_x[due] = vel_x[due] * speed[due] + ext_x[due]
+        total_y[due] = vel_y[due] * speed[due] + ext_y[due]
+
+        # Entity.travel: long steps split so no axis moves more than a tile between collision tests
+        steps = np.where(long_step, np.maximum(1, np.ceil(np.maximum(np.abs(total_x), np.abs(total_y)) * dt / ts)), due)
+        step_dt = dt / np.maximum(steps, 1)
+        for step in range(int(steps.max(initial=0))):
+            active = steps > step
+
+            y[active] += total_y[active] * step_dt[active]
+            rect_y[active] = rect_coords(y[active])
+            for rows, edge, moved in (((rect_y + ts - 1) // ts, -ts, active & (total_y > 0)), (rect_y // ts, ts, active & (total_y < 0))):
+                moved[moved] = blocks_row_many(blocking, rows[moved], rect_x[moved], rect_x[moved] + ts)
+                y[moved] = rows[moved] * ts + edge
+                vel_y[moved] = ext_y[moved] = total_y[moved] = 0
+            rect_y[active] = rect_coords(y[active])
+
+            x[active] += total_x[active] * step_dt[active]
+            rect_x[active] = rect_coords(x[active])
+            for columns, edge, moved in (((rect_x + ts - 1) // ts, -ts, active & (total_x > 0)), (rect_x // ts, ts, active & (total_x < 0))):
+                moved[moved] = blocks_column_many(blocking, columns[moved], rect_y[moved], rect_y[moved] + ts)
+                x[moved] = columns[moved] * ts + edge
+                vel_x[moved] = ext_x[moved] = total_x[moved] = 0
+            rect_x[active] = rect_coords(x[active])
+
+        # make all the enemies pursued, from the first pursuing one in list order on
+        if n:
+            following = (self.pursued | np.logical_or.accumulate(pursued)) & ~pursued
+            pursued[following] = True
+            scale_x[following], scale_y[following] = 0.5, 1.5
+            self.pursued = self.pursued or bool(pursued.any())
@@ -1,9 +1,12 @@
 # entities/entity.py — base class for Player & Enemy
 # Provides movement, scaling, collision helpers, health & drawing with shadow
 # Shared foundation for all in-world entities
-import pygame    
+import pygame, math
 from pygame.math import Vector2 as vec2
 
+from src.tiling.collision import blocks_row, blocks_column
+from src.utilities.transform_cache import transform_cache
+
 class Entity:
     def __init__(self, tile_size, pos):
         self.tile_size = tile_size
@@ -25,6 +28,7 @@ class Entity:
         self.vel = vec2(0, 0)
         self.ext_vel = vec2(0, 0)
         self.total_vel = vec2(0, 0)
+        self.long_step = False # dt covers several skipped frames, see update()
 
         self.health = 5
         self.flicker_timer = 0
@@ -41,70 +45,78 @@ class Entity:
         return
     
     def draw(self, draw_surf, camera_offset):
-        scale_x = self.scale_x
-        scale_y = self.scale_y
-
-        img = pygame.transform.scale(self.image.copy(), (self.image.get_width() * scale_x, self.image.get_height() * scale_y))
-        
-        if self.flicker_timer > 0 and int(self.flicker_timer) % 6 == 0:
-            img.fill('red')
+        tint = 'red' if self.flicker_timer > 0 and int(self.flicker_timer) % 6 == 0 else None
+        img = transform_cache().get(self.image, self.scale_x, self.scale_y, tint=tint)
 
         render_x = self.rect.x - camera_offset[0] - (img.get_width() - self.image.get_width()) / 2
         render_y = self.rect.y - camera_offset[1] - (img.get_width() - self.image.get_height()) / 2
 
-        draw_surf.blit(self.shadow, (self.rect.x - camera_offset[0] - (self.shadow.get_width() - self.image.get_width()) / 2, self.rect.y - camera_offset[1] + self.image.get_height()))
-        draw_surf.blit(img, (render_x, render_y))
+        # the screen rects drawn over, for dirty rect rendering
+        return [draw_surf.blit(self.shadow, (self.rect.x - camera_offset[0] - (self.shadow.get_width() - self.image.get_width()) / 2, self.rect.y - camera_offset[1] + self.image.get_height())),
+                draw_surf.blit(img, (render_x, render_y))]
     
-    def move(self, tiles):
+    def move(self, grid):
         if self.vel.length() > 0:
             self.vel = self.vel.normalize()
 
         speed = self.speed
         self.total_vel = self.vel * speed + self.ext_vel
-
-        self.y += self.total_vel.y * self.dt
-        self.rect.y = self.y
-        self.vertical_collision(tiles)
-        self.rect.y = self.y
-
-        self.x += self.total_vel.x * self.dt
-        self.rect.x = self.x
-        self.horizontal_collision(tiles)
-        self.rect.x = self.x
-
-    def vertical_collision(self, tiles):
-        for tile in tiles:
-
-            if tile.rect.colliderect(self.rect):
-
-                if self.total_vel.y > 0:
-                    self.y = tile.rect.top - self.rect.h
-                    self.vel.y = 0
-                    self.ext_vel.y = 0
-                    self.total_vel.y = 0
-                
-                elif self.total_vel.y < 0:
-                    self.y = tile.rect.bottom
-                    self.vel.y = 0
-                    self.ext_vel.y = 0
-                    self.total_vel.y = 0
-
-    def horizontal_collision(self, tiles):
-        for tile in tiles:
-
-            if tile.rect.colliderect(self.rect):
-            
-                if self.total_vel.x > 0:
-                    self.x = tile.rect.left - self.rect.w
-                    self.vel.x = 0
-                    self.ext_vel.x = 0
-                    self.total_vel.x = 0
-                
-                elif self.total_vel.x < 0:
-                    self.x = tile.rect.right
-                    self.vel.x = 0
-                    self.ext_vel.x = 0
-                    self.total_vel.x = 0
+        self.travel(grid)
+
+    def travel(self, grid):
+        # long steps are split so no axis moves more than a tile between collision tests
+        total_vel = self.total_vel
+        steps = (math.ceil(max(abs(total_vel.x), abs(total_vel.y)) * self.dt / self.tile_size) or 1) if self.long_step else 1
+        dt = self.dt / steps
+        for _ in range(steps):
+            self.y += total_vel.y * dt
+            self.rect.y = self.y
+            self.vertical_collision(grid)
+            self.rect.y = self.y
+
+            self.x += total_vel.x * dt
+            self.rect.x = self.x
+            self.horizontal_collision(grid)
+            self.rect.x = self.x
+
+    def vertical_collision(self, grid):
+        # only the row of tiles the leading edge moved into can stop the rect
+        ts = grid.tile_size
+
+        if self.total_vel.y > 0:
+            row = (self.rect.bottom - 1) // ts
+            if blocks_row(grid, row, self.rect.left, self.rect.right):
+                self.y = row * ts - self.rect.h
+                self.vel.y = 0
+                self.ext_vel.y = 0
+                self.total_vel.y = 0
+
+        elif self.total_vel.y < 0:
+            row = self.rect.top // ts
+            if blocks_row(grid, row, self.rect.left, self.rect.right):
+                self.y = (row + 1) * ts
+                self.vel.y = 0
+                self.ext_vel.y = 0
+                self.total_vel.y = 0
+
+    def horizontal_collision(self, grid):
+        ts = grid.tile_size
+
+        if self.total_vel.x > 0:
+            column = (self.rect.right - 1) // ts
+            if blocks_column(grid, column, self.rect.top, self.rect.bottom):
+                self.x = column * ts - self.rect.w
+                self.vel.x = 0
+                self.ext_vel.x = 0
+                self.total_vel.x = 0
+
+        elif self.total_vel.x < 0:
+            column = self.rect.left // ts
+            if blocks_column(grid, column, self.rect.top, self.rect.bottom):
+                self.x = (column + 1) * ts
+                self.vel.x = 0
+                self.ext_vel.x = 0
+                self.total_vel.x = 0
         
     def scale(self, scale_x=1.0, scale_y=1.0):
         self.scale_x = scale_x
@@ -115,12 +127,16 @@ class Entity:
         self.scale_x += (1.0 - self.scale_x) * speed * self.dt
         self.scale_y += (1.0 - self.scale_y) * speed * self.dt
         
-    def update(self, delta_time):
+    def update(self, delta_time, long_step=False):
+        """`long_step` says delta_time covers frames an UpdateScheduler skipped, not one frame."""
         self.dt = delta_time
+        self.long_step = long_step
         self.rescale()
 
-        self.ext_vel.x += (0 - self.ext_vel.x) * self.dt
-        self.ext_vel.y += (0 - self.ext_vel.y) * self.dt
+        # a long step is capped so it settles instead of overshooting, one frame integrates as it always did
+        decay = min(self.dt, 1) if long_step else self.dt
+        self.ext_vel.x += (0 - self.ext_vel.x) * decay
+        self.ext_vel.y += (0 - self.ext_vel.y) * decay
         
         if abs(self.ext_vel.x) < 0.001:
             self.ext_vel.x = 0
@@ -5,6 +5,7 @@ import pygame
 from pygame.math import Vector2 as vec2
 
 from src.entities.entity import Entity
+from src.utilities.transform_cache import transform_cache
 
 class Player(Entity):
     def __init__(self, tile_size, pos):
@@ -91,21 +92,14 @@ class Player(Entity):
             self.scale_x += (1.2 - self.scale_x) * 0.5 * self.dt
             self.scale_y += (0.8 - self.scale_y) * 0.5 * self.dt    
         
-        scale_x = self.scale_x
-        scale_y = self.scale_y
-
-        img = pygame.transform.scale(self.image.copy(), (self.image.get_width() * scale_x, self.image.get_height() * scale_y))
-        
-        if self.flicker_timer > 0 and int(self.flicker_timer) % 6 == 0:
-            img.fill('red')
-        
-        img = pygame.transform.rotate(img, self.angle)
-        shadow_img = self.shadow.copy()
+        tint = 'red' if self.flicker_timer > 0 and int(self.flicker_timer) % 6 == 0 else None
+        img = transform_cache().get(self.image, self.scale_x, self.scale_y, self.angle, tint)
+        shadow_img = self.shadow
         # shadow_img = pygame.transform.rotate(self.shadow.copy(), self.angle)
 
         render_x = self.rect.x - camera_offset[0] - (img.get_width() - self.image.get_width()) / 2
         render_y = self.rect.y - camera_offset[1] - (img.get_width() - self.image.get_height()) / 2
 
-        draw_surf.blit(shadow_img, (self.rect.x - camera_offset[0] - (shadow_img.get_width() - self.image.get_width()) / 2, self.rect.y - camera_offset[1] + self.image.get_height() - self.shadow.get_height()/4))
-        draw_surf.blit(img, (render_x, render_y))
+        return [draw_surf.blit(shadow_img, (self.rect.x - camera_offset[0] - (shadow_img.get_width() - self.image.get_width()) / 2, self.rect.y - camera_offset[1] + self.image.get_height() - self.shadow.get_height()/4)),
+                draw_surf.blit(img, (render_x, render_y))]
     
\ No newline at end of file
@@ -1,52 +1,85 @@
 # src/game.py — core Game class and world management
 # Handles world generation, entity updates, camera, rendering layers, and game state
 # Acts as central hub called each frame from main.py
-import pygame, random, math
+import pygame, random, math, time, warnings
+from concurrent.futures import ThreadPoolExecutor
 from pygame.math import Vector2 as vec2
 
-from src.tiling.terrain import generate_world_data
-from src.tiling.tile import Tile, auto_tile
+import numpy as np
+
+from src.tiling.world import ground_colours, ground_shades, object_shades, OCEAN_COLOURS
+from src.tiling.tilemap import TileMap, GROUND_FLAGS, OBJECT_FLAGS, BLOCKS_BULLETS, spawn_positions
+from src.tiling.collision import BlockingGrid, sweep_all
+from src.tiling.flow_field import FlowField
+from src.tiling.streaming import StreamingWorld
+from src.tiling.parallel import WorldBuilder
+from src.tiling.world_cache import WorldCache
+from src.tiling.chunk_cache import ChunkCache
 
 from src.entities.player import Player
 from src.weapon.bullet import BulletManager
 from src.entities.enemy import EnemyManager
+from src.entities.enemy_batch import BatchedEnemyManager
 from src.weapon.ranged import RangeWeapon
-from src.effects.shockwave import Shockwave
+from src.effects.shockwave import ShockwaveManager
+from src.effects.transition import CircleTransition
 from src.utilities.camera import Camera
-from src.effects.particle import Particle
+from src.effects.particle import ParticleSystem
 from src.utilities.cursor import Cursor
+from src.utilities.dirty import DirtyRects
+from src.utilities.gradient import radial_colours, UpsampledGradient
+from src.utilities.lru import surface_bytes
 
 from src.utilities.text import TextManager
 from src.utilities.utils import *
 
 class Game:
-    def __init__(self, window):
+    def __init__(self, window, streaming=False, workers=1, cache=False, memory_budget=32 * 1024 * 1024, batch_enemies=False, dirty_rects=False):
         self.window = window
+        self.streaming = streaming # generate chunks around the camera instead of the whole world up front
+        self.memory_budget = memory_budget # bytes of baked tile chunks (half) & upsampled gradient chunks kept by a world, loading one that holds more warns
+        self.enemy_manager_class = BatchedEnemyManager if batch_enemies else EnemyManager # NumPy arrays instead of one object per enemy
         self.WIDTH, self.HEIGHT = self.window.get_size()
         self.chunk_size = [32, 18]
         self.WORLD_MAP_SIZE = [self.WIDTH//16 * 5, self.HEIGHT//16 * 5]
-        self.fade = self.window.copy()
 
         self.tile_size = 16
 
         # Background colour (cyan theme)
         self.water_blue = (0, 180, 180)
+        self.transition = CircleTransition((self.WIDTH, self.HEIGHT), self.water_blue) # start & death fades
+
+        # with dirty rects the static layers are composed once per camera position & only what moved is repainted,
+        # `changed` is what main.py should update on the display, None for everything
+        self.dirty = DirtyRects((self.WIDTH, self.HEIGHT)) if dirty_rects else None
+        self.background = self.window.copy() if dirty_rects else None
+        self.background_key = None
+        self.changed = None
 
         self.cursor = Cursor(self.tile_size)
         self.text_manager = TextManager(self.tile_size, (self.WIDTH, self.HEIGHT))
         self.camera = Camera((self.WIDTH, self.HEIGHT), self.tile_size)
         
-        self.shockwaves = []
-        self.particles = []
+        self.shockwaves = ShockwaveManager(self.tile_size)
+        self.particles = ParticleSystem(self.tile_size)
 
         self.chunk_surfs = {} # cached tiles on chunk surfaces only used for rendering
-        self.ground_tiles = {}
-        self.tiles = {}
-
+        self.ground_tiles = None # TileMaps, see load()
+        self.tiles = None
+        self.blocking = None # merged movement & bullet blockers, see tiling/collision.py
+        self.bullet_blocking = None
+        self.flow_field = None
+
+        # builds the world in chunk-aligned strips across `workers` processes (0 = one per core)
+        self.world_builder = WorldBuilder(workers, self.chunk_size[1])
+        # generated worlds are kept on disk and memory-mapped back for seeds seen before
+        self.world_cache = WorldCache() if cache else None
+        # restart() swaps in a world prebuilt in the background, world_stats counts how often that worked
+        self.world_prebuilder = ThreadPoolExecutor(max_workers=1, thread_name_prefix='world-prebuild')
+        self.next_world = None
+        self.world_stats = {'prebuilt': 0, 'waited': 0, 'built': 0, 'failed': 0, 'restart_ms': 0, 'load_peak_mb': 0}
         self.load()
 
-        spawn_area =  [pos for pos, tile in self.ground_tiles.items() if tile.tile_type not in ('air', 'edge')]
-        self.spawn_area = [pos for pos in spawn_area if self.tiles[pos].tile_type in ('air', 'edge')]
         spawn_point = random.choice([pos for pos in self.spawn_area if ((pos[0] - self.WORLD_MAP_SIZE[0]//2)**2 + (pos[1] - self.WORLD_MAP_SIZE[1]//2)**2)**0.5 < self.WORLD_MAP_SIZE[1]/3])
         self.player = Player(self.tile_size, spawn_point)
 
@@ -54,7 +87,7 @@ class Game:
         self.lost = False
         self.upgraded = False
         self.wave = 1
-        self.enemy_manager = EnemyManager(self.tile_size)
+        self.enemy_manager = self.enemy_manager_class(self.tile_size)
         self.enemy_spawn_rate = 10
         self.spawn_enemies(self.enemy_spawn_rate)
 
@@ -64,33 +97,18 @@ class Game:
         self.radius = 0
         self.fade_in = False
         self.text_manager.queue_text(f"Wave {self.wave}", self.text_manager.BIG_FONT, {'center': (self.WIDTH/2, self.HEIGHT/2)})
+        self.prebuild_world()
     
     def spawn_enemies(self, amount):
+        if self.streaming: # only chunks around the camera exist
+            self.spawn_area = self.world.spawn_area()
         for i in range(amount):
             self.enemy_manager.spawn(random.choice(self.spawn_area))
 
-    def chunking(self, tiles):
-        tiles = tiles.copy()
-        for pos in tiles:
-            # Skip chunking air tiles - let background show through
-            if tiles[pos].tile_type == 'air':
-                continue
-                
-            chunk_offset = (pos[0] // self.chunk_size[0], pos[1] // self.chunk_size[1])
-            if chunk_offset not in self.chunk_surfs:
-                self.chunk_surfs[chunk_offset] = pygame.Surface((self.chunk_size[0] * self.tile_size, self.chunk_size[1] * self.tile_size), pygame.SRCALPHA).convert_alpha()
-            
-            tiles[pos].draw(self.chunk_surfs[chunk_offset], [chunk_offset[0] * self.chunk_size[0] * self.tile_size, chunk_offset[1] * self.chunk_size[1] * self.tile_size])
-
     def restart(self):
-        self.chunk_surfs = {} # cached tiles on chunk surfaces only used for rendering
-        self.ground_tiles = {}
-        self.tiles = {}
-
-        self.load()
+        start = time.perf_counter()
+        self.load(self.take_prebuilt_world())
 
-        spawn_area =  [pos for pos, tile in self.ground_tiles.items() if tile.tile_type not in ('air', 'edge')]
-        self.spawn_area = [pos for pos in spawn_area if self.tiles[pos].tile_type in ('air', 'edge')]
         spawn_point = random.choice([pos for pos in self.spawn_area if ((pos[0] - self.WORLD_MAP_SIZE[0]//2)**2 + (pos[1] - self.WORLD_MAP_SIZE[1]//2)**2)**0.5 < self.WORLD_MAP_SIZE[1]/3])
         self.player = Player(self.tile_size, spawn_point)
 
@@ -98,7 +116,7 @@ class Game:
         self.lost = False
         self.upgraded = False
         self.wave = 1
-        self.enemy_manager = EnemyManager(self.tile_size)
+        self.enemy_manager = self.enemy_manager_class(self.tile_size)
         self.enemy_spawn_rate = 10
         self.spawn_enemies(self.enemy_spawn_rate)
 
@@ -109,232 +127,198 @@ class Game:
         self.fade_in = False
         self.text_manager.queue_text(f"Wave {self.wave}", self.text_manager.BIG_FONT, {'center': (self.WIDTH/2, self.HEIGHT/2)})
 
-    def load(self):
-        seed = random.randint(0, 256)
-        terrain_data = {(-0.3, 1): 'dirt', (-0.5, -0.3): 'dirt2', (-1, -0.5): 'air'} # map data
-        tile_data = {(0.2, 1): 'dirt', (0, 0.2): 'dirt2', (-1, 0): 'air'} # tile data
-        
-        world_data = generate_world_data(self.WORLD_MAP_SIZE, terrain_data, seed)
-        obj_data = generate_world_data(self.WORLD_MAP_SIZE, tile_data, seed)
-
-        datas = [world_data, obj_data]
-        offices = [self.ground_tiles, self.tiles]
-
-        for i, data in enumerate(datas): # loop through world data and obj data
-            for pos in data:
-                terrain_type = data[pos]
-
-                if terrain_type == 'dirt' or terrain_type == 'dirt2':
-                    
-                    # if there is no tile (void | out of world) on top of current tile, make the current tile air tile
-                    if (pos[0], pos[1] - 1) not in data:
-                        terrain_type = 'air'
-                    
-                    # if there is no tile (void | out of world) underneath current tile, make the current tile edge tile
-                    if (pos[0], pos[1] + 1) not in data:
-                        terrain_type = 'edge' if (pos[0], pos[1] - 1) in data and data[(pos[0], pos[1] - 1)] in ['dirt', 'dirt2'] else 'air'
-                    
-                    # if there is tile underneath dirt tile and it is air tile, make the current tile edge tile
-                    elif data[(pos[0], pos[1] + 1)] == 'air':
-                        terrain_type = 'edge' if (pos[0], pos[1] - 1) in data and data[(pos[0], pos[1] - 1)] in ['dirt', 'dirt2'] else 'air'
-
-                    # terrain_type = 'dirt2'
-            
-                offices[i][pos] = Tile(terrain_type, self.tile_size, pos)
- 
-        # --- Apply outline-distance gradient colouring ---
-        from collections import deque
-
-        BASE_COLOUR = (150, 100, 230)  # core purple
-
-        # Collect all dirt positions from ground layer (walkable)
-        dirt_positions = [p for p, t in self.ground_tiles.items() if t.tile_type in ("dirt", "dirt2", "edge")]
-
-        # Identify outline (tiles with at least one non-dirt neighbour)
-        outline = []
-        dirt_set = set(dirt_positions)
-        for pos in dirt_positions:
-            for off in ((1,0),(-1,0),(0,1),(0,-1)):
-                if (pos[0]+off[0], pos[1]+off[1]) not in dirt_set:
-                    outline.append(pos)
-                    break
-
-        # BFS to compute distance from outline for each dirt tile
-        dist = {p: None for p in dirt_positions}
-        q = deque()
-        for p in outline:
-            dist[p] = 0
-            q.append(p)
-
-        max_d = 0
-        while q:
-            p = q.popleft()
-            for off in ((1,0),(-1,0),(0,1),(0,-1)):
-                nb = (p[0]+off[0], p[1]+off[1])
-                if nb in dist and dist[nb] is None:
-                    dist[nb] = dist[p] + 1
-                    max_d = max(max_d, dist[nb])
-                    q.append(nb)
-
-        # Apply gradient to ground_tiles (walkable foreground)
-        for pos, gtile in self.ground_tiles.items():
-            if pos in dist and dist[pos] is not None and gtile.tile_type in ("dirt", "dirt2", "edge"):
-                d = dist[pos]
-                t = d / max_d if max_d else 1
-                brightness = 0.6 + 0.4 * t
-                colour = tuple(int(c * brightness) for c in BASE_COLOUR)
-                gtile.image.fill(colour)
-
-        # Give tiles uniform darker purple so background is consistent
-        BG_COLOUR = (40, 20, 80)
-        for pos, tile in self.tiles.items():
-            if tile.tile_type in ("dirt", "dirt2", "edge"):
-                tile.image.fill(BG_COLOUR)
-
-        # --------- Create smooth gradient surface for ground layer ---------
-        import pygame
-        grad_lowres = pygame.Surface((self.WORLD_MAP_SIZE[0], self.WORLD_MAP_SIZE[1])).convert()
-        for (x, y), d in dist.items():
-            if d is None:
-                continue
-            t = d / max_d if max_d else 1
-            b = 0.4 + 0.4 * t  # overall darker (0.4–0.8)
-            colour = tuple(int(c * b) for c in BASE_COLOUR)
-            grad_lowres.set_at((x, y), colour)
-
-        # supersample to reduce blockiness
-        super_scale = 4  # moderate supersample; avoids excessive memory
-        big = pygame.transform.smoothscale(
-            grad_lowres,
-            (self.WORLD_MAP_SIZE[0] * self.tile_size * super_scale,
-             self.WORLD_MAP_SIZE[1] * self.tile_size * super_scale),
-        )
-        self.gradient_surf = pygame.transform.smoothscale(
-            big, (self.WORLD_MAP_SIZE[0] * self.tile_size, self.WORLD_MAP_SIZE[1] * self.tile_size)
-        )
-        self.gradient_surf.set_alpha(255)
-
-        # --------- Create ocean radial gradient (background) ---------
-        ocean_lowres = pygame.Surface((self.WORLD_MAP_SIZE[0], self.WORLD_MAP_SIZE[1])).convert()
-        cx, cy = self.WORLD_MAP_SIZE[0]/2, self.WORLD_MAP_SIZE[1]/2
-        max_r = (cx**2 + cy**2) ** 0.5
-
-        inner_col = (64, 209, 225)   # light aqua
-        mid_col   = (15, 47, 112)    # deep blue
-        outer_col = (0, 0, 0)        # near-black
-
-        for x in range(self.WORLD_MAP_SIZE[0]):
-            for y in range(self.WORLD_MAP_SIZE[1]):
-                dx = x - cx
-                dy = y - cy
-                t = min(((dx*dx + dy*dy) ** 0.5) / max_r, 1)
-                if t < 0.5:
-                    # interpolate inner -> mid
-                    tt = t*2
-                    r = int(inner_col[0] + (mid_col[0]-inner_col[0])*tt)
-                    g = int(inner_col[1] + (mid_col[1]-inner_col[1])*tt)
-                    b = int(inner_col[2] + (mid_col[2]-inner_col[2])*tt)
-                else:
-                    tt = (t-0.5)*2
-                    r = int(mid_col[0] + (outer_col[0]-mid_col[0])*tt)
-                    g = int(mid_col[1] + (outer_col[1]-mid_col[1])*tt)
-                    b = int(mid_col[2] + (outer_col[2]-mid_col[2])*tt)
-                ocean_lowres.set_at((x, y), (r, g, b))
-
-        ocean_big = pygame.transform.smoothscale(
-            ocean_lowres,
-            (self.WORLD_MAP_SIZE[0] * self.tile_size * super_scale,
-             self.WORLD_MAP_SIZE[1] * self.tile_size * super_scale),
-        )
-        self.ocean_surf = pygame.transform.smoothscale(
-            ocean_big,
-            (self.WORLD_MAP_SIZE[0] * self.tile_size, self.WORLD_MAP_SIZE[1] * self.tile_size),
-        )
-
-        self.ground_tiles = auto_tile(self.ground_tiles, self.tile_size)
-        self.tiles = auto_tile(self.tiles, self.tile_size)
-        
-        self.chunking(self.ground_tiles)
-        self.chunking(self.tiles)
-
-    def draw(self, camera_offset):
+        self.world_stats['restart_ms'] = (time.perf_counter() - start) * 1000
+        self.prebuild_world()
+
+    def build_world(self, seed):
+        """Everything load() installs for a world, safe to run on the prebuild thread."""
+        if self.streaming:
+            # islands repeat every WORLD_MAP_SIZE tiles, only the view around the first one's center is built now
+            world = StreamingWorld(seed, self.WORLD_MAP_SIZE, self.chunk_size, self.tile_size)
+            view = pygame.Rect(0, 0, self.WIDTH, self.HEIGHT)
+            view.center = (self.WORLD_MAP_SIZE[0]//2 * self.tile_size, self.WORLD_MAP_SIZE[1]//2 * self.tile_size)
+            world.update(view)
+            return {'world': world, 'ground_tiles': world.ground_tiles, 'tiles': world.tiles, 'chunk_surfs': world.chunk_surfs, 'blocking': world.blocking, 'bullet_blocking': world.bullet_blocking,
+                    'gradient_layer': None, 'ocean_layer': None, 'spawn_area': world.spawn_area()}
+
+        # every layer, its air/edge rules, outline masks & coast distance as arrays
+        layers = self.world_cache.load(seed, self.WORLD_MAP_SIZE) if self.world_cache else None
+        if layers is None:
+            layers = self.world_builder.build(seed, self.WORLD_MAP_SIZE)
+            if self.world_cache:
+                self.world_cache.store(seed, self.WORLD_MAP_SIZE, layers)
+        ground_tiles = TileMap(layers.ground, layers.ground_masks, ground_shades(layers.distance, layers.max_distance), self.tile_size, GROUND_FLAGS)
+        tiles = TileMap(layers.obj, layers.obj_masks, object_shades(layers.obj), self.tile_size, OBJECT_FLAGS)
+        blocking = BlockingGrid(ground_tiles, tiles) # what player & enemy movement collides with
+        bullet_blocking = BlockingGrid(ground_tiles, tiles, BLOCKS_BULLETS, void=True) # and bullets, off the world too
+
+        # --------- Smooth gradients for the ground layer & ocean, upsampled per chunk when drawn ---------
+        colours = ground_colours(layers.distance, layers.max_distance, 0.4).clip(0) # overall darker (0.4–0.8), black off the ground
+        chunk_px = (self.chunk_size[0] * self.tile_size, self.chunk_size[1] * self.tile_size)
+        gradient_layer = UpsampledGradient(colours, self.tile_size, chunk_px, self.memory_budget // 4)
+        ocean_layer = UpsampledGradient(radial_colours(tuple(self.WORLD_MAP_SIZE), OCEAN_COLOURS), self.tile_size, chunk_px, self.memory_budget // 4)
+
+        # chunks are baked the first time they are drawn, see draw()
+        chunk_surfs = ChunkCache((ground_tiles, tiles), self.chunk_size, self.tile_size, self.memory_budget // 2)
+
+        return {'world': None, 'ground_tiles': ground_tiles, 'tiles': tiles, 'chunk_surfs': chunk_surfs, 'blocking': blocking, 'bullet_blocking': bullet_blocking,
+                'gradient_layer': gradient_layer, 'ocean_layer': ocean_layer, 'spawn_area': spawn_positions(ground_tiles, tiles)}
+
+    def load(self, world=None):
+        if world is None:
+            world = self.build_world(random.randint(0, 256))
+
+        self.world = world['world']
+        self.ground_tiles = world['ground_tiles']
+        self.tiles = world['tiles']
+        self.blocking = world['blocking']
+        self.bullet_blocking = world['bullet_blocking']
+        # enemies path towards the player along one shared field, over the whole world or the chunks around the player
+        if self.streaming:
+            self.flow_field = FlowField(self.blocking, (self.chunk_size[0] * 3, self.chunk_size[1] * 3))
+        else:
+            self.flow_field = FlowField(self.blocking, self.blocking.size, self.blocking.origin)
+        self.chunk_surfs = world['chunk_surfs']
+        self.gradient_layer = world['gradient_layer']
+        self.ocean_layer = world['ocean_layer']
+        self.spawn_area = world['spawn_area']
+        load_bytes = self.world_bytes(world)
+        self.world_stats['load_peak_mb'] = load_bytes / 2**20
+        if load_bytes > self.memory_budget:
+            warnings.warn(f"the world holds {load_bytes / 2**20:.1f} MB, over the {self.memory_budget / 2**20:.1f} MB memory budget")
+
+    def world_bytes(self, world):
+        """Bytes a world from build_world() holds: its tile arrays, gradient images & the most its chunk caches held."""
+        if world['world'] is not None:
+            maps = [*world['ground_tiles'].maps.values(), *world['tiles'].maps.values()]
+            return sum(tilemap.nbytes for tilemap in maps) + sum(surface_bytes(surf) for surf in world['chunk_surfs'].values())
+        return (world['ground_tiles'].nbytes + world['tiles'].nbytes + world['chunk_surfs'].surfs.peak_bytes
+                + world['gradient_layer'].peak_bytes + world['ocean_layer'].peak_bytes)
+
+    def prebuild_world(self):
+        # the next world is built on a worker thread while this run is played
+        if self.streaming or self.next_world is not None:
+            return
+        self.next_world = self.world_prebuilder.submit(self.build_world, random.randint(0, 256))
+
+    def take_prebuilt_world(self):
+        future, self.next_world = self.next_world, None
+        if future is None:
+            self.world_stats['built'] += 1
+            return None
+
+        # a world still being built is waited for, it is further along than starting over
+        self.world_stats['prebuilt' if future.done() else 'waited'] += 1
+        try:
+            return future.result()
+        except Exception:
+            self.world_stats['failed'] += 1
+            return None
+
+    def draw_background(self, surf, camera_offset, view, chunk_px):
         # Clear window with ocean color to prevent black background
-        self.window.fill(self.water_blue)  # cyan background
+        surf.fill(self.water_blue)  # cyan background
         
         # DEBUG: Draw simple colored rectangles instead of complex surfaces
         # Draw ocean background - full window cyan rectangle (slightly darker)
-        pygame.draw.rect(self.window, (0, 150, 150), (0, 0, self.WIDTH, self.HEIGHT))
+        pygame.draw.rect(surf, (0, 150, 150), (0, 0, self.WIDTH, self.HEIGHT))
         
         # Draw terrain background - offset purple rectangle
-        pygame.draw.rect(self.window, (120, 80, 180), 
+        pygame.draw.rect(surf, (120, 80, 180), 
                         (100 - camera_offset[0], 100 - camera_offset[1], 400, 200))
         
         # Original surface rendering (commented out for debug)
-        # self.window.blit(self.ocean_surf, (-camera_offset[0], -camera_offset[1]))
-        # self.window.blit(self.gradient_surf, (-camera_offset[0], -camera_offset[1]))
-
-        player_chunk_offset = get_offset(self.player, (self.chunk_size[0] * self.tile_size, self.chunk_size[1] * self.tile_size))
-        neighbor_offsets = [(-1, -1), (0, -1), (1, -1),
-                            (-1, 0), (0, 0), (1, 0),
-                            (-1, 1), (0, 1), (1, 1)]
-
-        for offset in neighbor_offsets:
-            chunk_offset = (player_chunk_offset[0] + offset[0], player_chunk_offset[1] + offset[1])
-            try:
-                self.window.blit(self.chunk_surfs[chunk_offset], [chunk_offset[0] * self.chunk_size[0] * self.tile_size - camera_offset[0], chunk_offset[1] * self.chunk_size[1] * self.tile_size - camera_offset[1]])
-            except KeyError:
-                pass
-
-        self.enemy_manager.draw(self.window, camera_offset)
-        self.player.draw(self.window, camera_offset)
-        self.bullet_manager.draw(self.window, camera_offset)
-
-        for shockwave in self.shockwaves.copy():
-            shockwave.draw(self.window, camera_offset)
-            if shockwave.update(self.dt):
-                self.shockwaves.remove(shockwave)
-        
-        for particle in self.particles.copy():
-            particle.draw(self.window, camera_offset)
-            if particle.update(self.dt):
-                self.particles.remove(particle)
+        # self.ocean_layer.draw(surf, camera_offset)
+        # self.gradient_layer.draw(surf, camera_offset)
+
+        # only the chunks the camera actually sees
+        for chunk_offset in view.chunks(chunk_px):
+            if chunk_offset in self.chunk_surfs:
+                surf.blit(self.chunk_surfs[chunk_offset], [chunk_offset[0] * chunk_px[0] - camera_offset[0], chunk_offset[1] * chunk_px[1] - camera_offset[1]])
+
+    def draw(self, camera_offset):
+        """Draws the world layers, returns the screen rects drawn over the background."""
+        view = self.camera.view
+        chunk_px = (self.chunk_size[0] * self.tile_size, self.chunk_size[1] * self.tile_size)
+        if self.dirty:
+            key = (camera_offset, id(self.chunk_surfs), tuple(chunk for chunk in view.chunks(chunk_px) if chunk in self.chunk_surfs))
+            if key != self.background_key: # the camera moved, recompose
+                self.background_key = key
+                self.draw_background(self.background, camera_offset, view, chunk_px)
+                self.window.blit(self.background, (0, 0))
+                self.dirty.redraw()
+            else:
+                self.dirty.restore(self.window, self.background)
+        else:
+            self.draw_background(self.window, camera_offset, view, chunk_px)
+
+        # bake the chunks the camera is heading towards before they come into view
+        if not self.streaming:
+            self.chunk_surfs.prefetch(view.ahead(chunk_px))
+
+        rects = self.enemy_manager.draw(self.window, camera_offset, view)
+        rects += self.player.draw(self.window, camera_offset)
+        rects += self.bullet_manager.draw(self.window, camera_offset, view)
+
+        rects += self.shockwaves.draw(self.window, camera_offset, view)
+        self.shockwaves.update(self.dt)
+
+        rects += self.particles.draw(self.window, camera_offset, view)
+        self.particles.update(self.dt)
 
         # render player health
         for i in range(self.player.health):
             pygame.draw.rect(self.window, 'red', (10 + i * self.tile_size, 10, self.tile_size/1.5, self.tile_size/1.5))
-            pygame.draw.rect(self.window, 'white', (10 + i * self.tile_size, 10, self.tile_size/1.5, self.tile_size/1.5), 1)
+            rects.append(pygame.draw.rect(self.window, 'white', (10 + i * self.tile_size, 10, self.tile_size/1.5, self.tile_size/1.5), 1))
+        return rects
 
     def minimap(self):
-        pygame.draw.rect(self.window, (0, 0, 0), (self.WIDTH - self.WORLD_MAP_SIZE[0], 0, self.WORLD_MAP_SIZE[0], self.WORLD_MAP_SIZE[1]), 1)
+        box = pygame.draw.rect(self.window, (0, 0, 0), (self.WIDTH - self.WORLD_MAP_SIZE[0], 0, self.WORLD_MAP_SIZE[0], self.WORLD_MAP_SIZE[1]), 1)
+        rects = []
         for entity in self.enemy_manager.enemies:
             enemy_offset = get_offset(entity, [self.tile_size]*2)
-            pygame.draw.rect(self.window, 'white', (enemy_offset[0] + self.WIDTH - self.WORLD_MAP_SIZE[0], enemy_offset[1], 2, 2))
+            rects.append(pygame.draw.rect(self.window, 'white', (enemy_offset[0] + self.WIDTH - self.WORLD_MAP_SIZE[0], enemy_offset[1], 2, 2)))
         player_offset = get_offset(self.player, [self.tile_size]*2)
-        pygame.draw.rect(self.window, 'blue', (player_offset[0] + self.WIDTH - self.WORLD_MAP_SIZE[0], player_offset[1], 2, 2))
+        rects.append(pygame.draw.rect(self.window, 'blue', (player_offset[0] + self.WIDTH - self.WORLD_MAP_SIZE[0], player_offset[1], 2, 2)))
+
+        # what the camera sees, one minimap pixel per tile
+        view = self.camera.view.rect
+        rects.append(pygame.draw.rect(self.window, 'white', (view.x // self.tile_size + self.WIDTH - self.WORLD_MAP_SIZE[0], view.y // self.tile_size, view.w // self.tile_size, view.h // self.tile_size), 1))
+        return [box.unionall(rects)]
 
     def entities_collisions(self):
+        # broadphase: only bullets sharing a grid cell with an enemy, only enemies near the player
+        self.bullet_manager.grid.build(self.bullet_manager.bullets)
+        self.enemy_manager.grid.build(self.enemy_manager.enemies)
+        near_player = set(self.enemy_manager.grid.query(self.player.rect))
+
+        # removals are applied after the pass so no enemy or bullet gets skipped
+        dead, spent = set(), set()
         for entity in self.enemy_manager.enemies:
-            for bullet in self.bullet_manager.bullets:
-                
+            for bullet in self.bullet_manager.grid.query(entity.rect):
+                if entity in dead or bullet in spent:
+                    continue
+
                 # enemy bullet collision
                 if entity.rect.colliderect(bullet.rect):
                     if entity.deduct_health(bullet.damage):
                         self.camera.start_shake(4)
-                        self.particles += [Particle((entity.rect.centerx + random.randint(8, 10), entity.rect.centery + random.randint(8, 10)), bullet.angle + random.randint(10, 30) * random.choice([-1, 1]), self.tile_size) for i in range(random.randint(1, 4))]
+                        for i in range(random.randint(1, 4)):
+                            self.particles.emit((entity.rect.centerx + random.randint(8, 10), entity.rect.centery + random.randint(8, 10)), bullet.angle + random.randint(10, 30) * random.choice([-1, 1]))
 
                         entity.ext_vel = vec2(1, 0).rotate(bullet.angle).normalize() * 4 # knockback
                         entity.get_pursue()
 
                         if entity.health <= 0:
-                            self.shockwaves.append(Shockwave(entity.rect.center, self.tile_size))
-                            self.enemy_manager.enemies.remove(entity)
+                            self.shockwaves.add(entity.rect.center)
+                            dead.add(entity)
 
                         bullet.piercing -= 1
                         if bullet.piercing <= 0:
-                            self.bullet_manager.bullets.remove(bullet)
+                            spent.add(bullet)
 
             # enemy player collision
-            if entity.rect.colliderect(self.player.rect):
+            if entity in near_player and entity.rect.colliderect(self.player.rect):
                 if self.player.deduct_health(entity.damage):
                     self.camera.start_shake(6)
                             
@@ -347,19 +331,32 @@ class Game:
 
                     self.game_state()
 
+        if dead:
+            self.enemy_manager.enemies = [entity for entity in self.enemy_manager.enemies if entity not in dead]
+        if spent:
+            self.bullet_manager.bullets = [bullet for bullet in self.bullet_manager.bullets if bullet not in spent]
+
     def tile_bullet_collision(self):
-        for bullet in self.bullet_manager.bullets:
+        # every bullet steps through the tiles its path crossed this tick together, no matter how far it moved
+        hits = sweep_all(self.bullet_blocking, [bullet.segment() for bullet in self.bullet_manager.bullets])
+        spent = set()
+        for bullet, hit in zip(self.bullet_manager.bullets, hits):
             destroy = bullet.destroy()
-            collided = bullet.collision(self.tiles.get(get_offset(bullet, [self.tile_size]*2), None))
-            if destroy or collided:
-                self.particles += [Particle((bullet.rect.centerx + random.randint(8, 10), bullet.rect.centery + random.randint(8, 10)), bullet.angle + random.randint(10, 30) * random.choice([-1, 1]), self.tile_size) for i in range(random.randint(1, 4))]
-                self.bullet_manager.bullets.remove(bullet)
+            if hit is not None:
+                bullet.stop(hit[1])
+            if destroy or hit is not None:
+                for i in range(random.randint(1, 4)):
+                    self.particles.emit((bullet.rect.centerx + random.randint(8, 10), bullet.rect.centery + random.randint(8, 10)), bullet.angle + random.randint(10, 30) * random.choice([-1, 1]))
+                spent.add(bullet)
+        if spent:
+            self.bullet_manager.bullets = [bullet for bullet in self.bullet_manager.bullets if bullet not in spent]
 
     def game_state(self):
         if self.player.health <= 0:
             self.lost = True
             self.fade_in = True
-            self.shockwaves.append(Shockwave(self.player.rect.center, self.tile_size))
+            self.prebuild_world() # no-op unless the run started without one
+            self.shockwaves.add(self.player.rect.center)
 
     def upgrade(self):
         if len(self.enemy_manager.enemies) <= 0:
@@ -426,6 +423,8 @@ class Game:
         mbutton = pygame.mouse.get_pressed()
                 
         camera_offset = self.camera.offset(self.player, self.dt, mx, my)
+        if self.world:
+            self.world.update(self.camera.view.rect)
         self.player.update(self.dt)
         
         if self.game_started and self.lost == False:
@@ -435,17 +434,10 @@ class Game:
             if len(self.bullet_manager.bullets) > 0 or self.player.rect.topleft != self.player.ori_pos:
                 self.enemy_manager.pursued = True
 
-            player_offset = get_offset(self.player, [self.tile_size]*2)
-            collide_tiles = []
-            for offset in [(-1, 0), (0, -1), (1, 0), (0, 1), (-1, -1), (1, -1), (-1, 1), (1, 1)]:
-                tile_offset = (player_offset[0] + offset[0], player_offset[1] + offset[1])
-                if tile_offset in self.ground_tiles:
-                    collide_tiles.append(self.ground_tiles[tile_offset]) if self.ground_tiles[tile_offset].tile_type in ['air', 'edge'] else None
-                if tile_offset in self.tiles:
-                    collide_tiles.append(self.tiles[tile_offset]) if self.tiles[tile_offset].tile_type not in ['air', 'edge'] else None
-            self.player.move(collide_tiles)
-
-            self.enemy_manager.update(self.dt, self.player, self.ground_tiles, self.tiles)
+            self.player.move(self.blocking)
+
+            self.flow_field.update((self.player.rect.centerx // self.tile_size, self.player.rect.centery // self.tile_size))
+            self.enemy_manager.update(self.dt, self.player, self.blocking, self.flow_field, self.camera.view)
             self.weapon.update(self.dt)
             self.bullet_manager.update(self.dt)
             self.tile_bullet_collision()
@@ -454,9 +446,9 @@ class Game:
             self.upgrade()
             self.spawn_wave()
 
-        self.draw(camera_offset)
-        self.minimap()
-        self.cursor.update(self.dt, self.window, (mx, my))
+        rects = self.draw(camera_offset)
+        rects += self.minimap()
+        rects += self.cursor.update(self.dt, self.window, (mx, my))
         
         # UI 
         # will only run once at the start of the program
@@ -471,7 +463,7 @@ class Game:
             if self.fade_in:
                 if self.radius > 0:
                     self.radius -= 10 * self.dt
-                else:
+                elif not self.text_manager.need_input: # queued once, they stay until restart
                     self.text_manager.queue_text("You Died", self.text_manager.BIG_FONT, {'center': (self.WIDTH/2, self.HEIGHT/2 - self.tile_size)}, None)
                     self.text_manager.queue_text("Press R to restart", self.text_manager.BIG_FONT, {'center': (self.WIDTH/2, self.HEIGHT/2 + self.tile_size)}, None)
                     self.text_manager.queue_text("Thank you for playing!", self.text_manager.SMALL_FONT, {'center': (self.WIDTH/2, self.HEIGHT - self.tile_size)}, None)
@@ -484,12 +476,22 @@ class Game:
                     self.lost = False
 
         if self.game_started == False or self.lost:      
-            self.fade.fill(self.water_blue)  # Use cyan for fade bg
-            self.fade.set_colorkey((255, 255, 255))
-            pygame.draw.circle(self.fade, (255, 255, 255), (self.WIDTH/2, self.HEIGHT/2), self.radius)
-            self.window.blit(self.fade, (0, 0))
+            self.transition.draw(self.window, self.radius)
+            if self.transition.covered(self.radius):
+                rects = []
+                if self.dirty:
+                    self.dirty.cover()
+            else:
+                rects.append((0, 0, self.WIDTH, self.HEIGHT))
 
         self.text_manager.draw(self.window, self.dt)
+        if self.dirty:
+            self.dirty.add(*rects, *self.text_manager.drawn)
+            self.changed = self.dirty.end()
+
+    def shutdown(self):
+        self.world_prebuilder.shutdown(cancel_futures=True)
+        self.world_builder.shutdown()
 
     def event_controls(self, event):
         if event.type == pygame.KEYUP:
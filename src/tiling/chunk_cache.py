@@ -0,0 +1,74 @@
+# tiling/chunk_cache.py — chunk surfaces baked on demand from the tile layers
+# ChunkCache bakes a chunk the first time it is drawn or prefetched & keeps baked chunks in a memory bounded LRU
+# Evicted chunks are simply baked again, the tile layers are the source of truth
+import time
+
+import pygame
+
+from src.utilities.lru import ByteLRU, surface_bytes
+
+class ChunkCache:
+    """Chunk offset -> baked SRCALPHA surface of every layer in `layers`, bottom layer first.
+
+    Only chunks holding a drawn tile exist, looking up any other chunk raises
+    KeyError like the old chunk dict did.
+    """
+    def __init__(self, layers, chunk_size, tile_size, max_bytes=16 * 1024 * 1024):
+        self.layers = layers
+        self.chunk_size = chunk_size
+        self.tile_size = tile_size
+        self.chunk_px = (chunk_size[0] * tile_size, chunk_size[1] * tile_size)
+        self.chunks = set().union(*(layer.chunks(chunk_size) for layer in layers))
+
+        self.surfs = ByteLRU(max_bytes, surface_bytes)
+
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+        self.bake_time = 0 # seconds spent baking, misses and prefetches
+
+    def bake(self, chunk):
+        start = time.perf_counter()
+        surf = pygame.Surface(self.chunk_px, pygame.SRCALPHA).convert_alpha()
+        area = (chunk[0] * self.chunk_size[0], chunk[1] * self.chunk_size[1], self.chunk_size[0], self.chunk_size[1])
+        for layer in self.layers:
+            layer.draw(surf, (chunk[0] * self.chunk_px[0], chunk[1] * self.chunk_px[1]), area)
+
+        self.surfs.put(chunk, surf)
+        self.bake_time += time.perf_counter() - start
+        return surf
+
+    def __getitem__(self, chunk):
+        surf = self.surfs.get(chunk)
+        if surf is not None:
+            self.hits += 1
+            return surf
+        if chunk not in self.chunks:
+            raise KeyError(chunk)
+        self.misses += 1
+        return self.bake(chunk)
+
+    def get(self, chunk, default=None):
+        return self[chunk] if chunk in self.chunks else default
+
+    def __contains__(self, chunk):
+        return chunk in self.chunks
+
+    def __iter__(self):
+        return iter(sorted(self.chunks))
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def keys(self):
+        return sorted(self.chunks)
+
+    def prefetch(self, chunks, limit=1):
+        """Bake up to `limit` of `chunks` that are not baked yet, in order."""
+        for chunk in chunks:
+            if limit <= 0:
+                break
+            if chunk in self.chunks and chunk not in self.surfs:
+                self.bake(chunk)
+                self.prefetched += 1
+                limit -= 1
@@ -0,0 +1,168 @@
+# tiling/collision.py — tile collision against precomputed blocking grids
+# BlockingGrid merges the ground (air/edge) & object (dirt) rules for movement or bullets into one byte per tile at load time
+# Entities resolve their rect per axis by testing only the row/column of tiles their leading edge moved into
+# Bullets sweep the segment they travelled this tick through the grid (DDA) so fast ones can't tunnel through walls, all of them at once
+import math
+
+import numpy as np
+
+from src.tiling.tilemap import BLOCKS_MOVEMENT
+from src.tiling.world import VOID
+
+class BlockingGrid:
+    """Tiles of a TileMap pair with any of `flags` set.
+
+    With `void` set, tiles without an object (VOID or outside the grid) block
+    too, that's where bullets leave the world.
+    """
+    def __init__(self, ground, objects, flags=BLOCKS_MOVEMENT, void=False):
+        self.tile_size = ground.tile_size
+        self.origin = ground.origin
+        self.size = ground.size
+        self.void = void
+        blocking = ((ground.flags | objects.flags) & flags) != 0
+        if void:
+            blocking |= objects.codes == VOID
+        self.cells = bytes(blocking.T.tobytes()) # row major, y * w + x
+
+    def blocked(self, tx, ty):
+        x, y = tx - self.origin[0], ty - self.origin[1]
+        if 0 <= x < self.size[0] and 0 <= y < self.size[1]:
+            return self.cells[y * self.size[0] + x] == 1
+        return self.void
+
+    def blocked_many(self, tx, ty):
+        """blocked() for arrays of tile positions at once."""
+        x, y = tx - self.origin[0], ty - self.origin[1]
+        inside = (x >= 0) & (x < self.size[0]) & (y >= 0) & (y < self.size[1])
+        cells = np.frombuffer(self.cells, dtype=np.uint8)
+        result = np.full(inside.shape, self.void)
+        result[inside] = cells[y[inside] * self.size[0] + x[inside]] == 1
+        return result
+
+class BlockingChunks:
+    """BlockingGrids of streamed chunks behind the same lookup."""
+    def __init__(self, chunk_size, tile_size, void=False):
+        self.chunk_size = chunk_size
+        self.tile_size = tile_size
+        self.void = void # whether chunks that aren't generated block
+        self.grids = {} # chunk offset -> BlockingGrid
+
+    def blocked(self, tx, ty):
+        grid = self.grids.get((tx // self.chunk_size[0], ty // self.chunk_size[1]))
+        return self.void if grid is None else grid.blocked(tx, ty)
+
+    def blocked_many(self, tx, ty):
+        cx, cy = tx // self.chunk_size[0], ty // self.chunk_size[1]
+        result = np.full(tx.shape, self.void)
+        for chunk in set(zip(cx.tolist(), cy.tolist())):
+            grid = self.grids.get(chunk)
+            if grid is not None:
+                inside = (cx == chunk[0]) & (cy == chunk[1])
+                result[inside] = grid.blocked_many(tx[inside], ty[inside])
+        return result
+
+def blocks_row(grid, row, left, right):
+    """Whether any tile of `row` under the pixel span [left, right) blocks."""
+    ts = grid.tile_size
+    return any(grid.blocked(tx, row) for tx in range(left // ts, (right - 1) // ts + 1))
+
+def blocks_column(grid, column, top, bottom):
+    ts = grid.tile_size
+    return any(grid.blocked(column, ty) for ty in range(top // ts, (bottom - 1) // ts + 1))
+
+def blocks_row_many(grid, row, left, right):
+    """blocks_row() for arrays of rows & pixel spans at once."""
+    ts = grid.tile_size
+    first, last = left // ts, (right - 1) // ts
+    hit = np.zeros(row.shape, dtype=bool)
+    for step in range(int((last - first).max(initial=0)) + 1):
+        spans = first + step <= last
+        hit[spans] |= grid.blocked_many(first[spans] + step, row[spans])
+    return hit
+
+def blocks_column_many(grid, column, top, bottom):
+    ts = grid.tile_size
+    first, last = top // ts, (bottom - 1) // ts
+    hit = np.zeros(column.shape, dtype=bool)
+    for step in range(int((last - first).max(initial=0)) + 1):
+        spans = first + step <= last
+        hit[spans] |= grid.blocked_many(column[spans], first[spans] + step)
+    return hit
+
+def sweep(grid, start, end):
+    """First blocking tile the segment start -> end passes through & the point it enters it, or None.
+
+    Tiles are visited in order along the segment (Amanatides & Woo), the start
+    tile included, so a hit at the start reports the start point.
+    """
+    ts = grid.tile_size
+    tx, ty = math.floor(start[0] / ts), math.floor(start[1] / ts)
+    if grid.blocked(tx, ty):
+        return (tx, ty), start
+    end_x, end_y = math.floor(end[0] / ts), math.floor(end[1] / ts)
+
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    step_x, step_y = (1 if dx > 0 else -1), (1 if dy > 0 else -1)
+    # segment fraction at which the next vertical/horizontal tile border is crossed, and between borders
+    next_x = ((tx + (dx > 0)) * ts - start[0]) / dx if dx else math.inf
+    next_y = ((ty + (dy > 0)) * ts - start[1]) / dy if dy else math.inf
+    delta_x = ts / abs(dx) if dx else math.inf
+    delta_y = ts / abs(dy) if dy else math.inf
+
+    for _ in range(abs(end_x - tx) + abs(end_y - ty)):
+        # an axis that reached the end tile never steps again, float error can't overshoot it
+        if ty == end_y or (tx != end_x and next_x < next_y):
+            tx += step_x
+            t, next_x = next_x, next_x + delta_x
+        else:
+            ty += step_y
+            t, next_y = next_y, next_y + delta_y
+        if grid.blocked(tx, ty):
+            t = min(t, 1)
+            return (tx, ty), (start[0] + dx * t, start[1] + dy * t)
+    return None
+
+def sweep_all(grid, segments):
+    """sweep() for every (start, end) in `segments`, a list of hits or None in the same order.
+
+    Every segment steps through its tiles together, one array step & one
+    blocked_many() gather per tile crossed by the longest of them.
+    """
+    if not segments:
+        return []
+    ts = grid.tile_size
+    points = np.array(segments, dtype=np.float64) # (n, start/end, x/y)
+    start, end = points[:, 0], points[:, 1]
+    tx, ty = np.floor(start[:, 0] / ts).astype(np.int64), np.floor(start[:, 1] / ts).astype(np.int64)
+    end_x, end_y = np.floor(end[:, 0] / ts).astype(np.int64), np.floor(end[:, 1] / ts).astype(np.int64)
+
+    dx, dy = end[:, 0] - start[:, 0], end[:, 1] - start[:, 1]
+    step_x, step_y = np.where(dx > 0, 1, -1), np.where(dy > 0, 1, -1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        next_x = np.where(dx != 0, ((tx + (dx > 0)) * ts - start[:, 0]) / dx, np.inf)
+        next_y = np.where(dy != 0, ((ty + (dy > 0)) * ts - start[:, 1]) / dy, np.inf)
+        delta_x = np.where(dx != 0, ts / np.abs(dx), np.inf)
+        delta_y = np.where(dy != 0, ts / np.abs(dy), np.inf)
+    steps = np.abs(end_x - tx) + np.abs(end_y - ty)
+
+    hit = grid.blocked_many(tx, ty)
+    at_start = hit.copy()
+    t = np.zeros(len(segments)) # where along its segment each hit is
+    for step in range(int(steps.max())):
+        moving = np.flatnonzero(~hit & (step < steps))
+        if not len(moving):
+            break
+        # same choice as sweep(): an axis that reached the end tile never steps again
+        on_x = (ty[moving] == end_y[moving]) | ((tx[moving] != end_x[moving]) & (next_x[moving] < next_y[moving]))
+        xs, ys = moving[on_x], moving[~on_x]
+        tx[xs] += step_x[xs]
+        t[xs], next_x[xs] = next_x[xs], next_x[xs] + delta_x[xs]
+        ty[ys] += step_y[ys]
+        t[ys], next_y[ys] = next_y[ys], next_y[ys] + delta_y[ys]
+        hit[moving] = grid.blocked_many(tx[moving], ty[moving])
+
+    t = np.minimum(t, 1)
+    points = zip((start[:, 0] + dx * t).tolist(), (start[:, 1] + dy * t).tolist())
+    return [((x, y), (segment[0] if first else point)) if blocked else None
+            for blocked, first, x, y, point, segment in zip(hit.tolist(), at_start.tolist(), tx.tolist(), ty.tolist(), points, segments)]
@@ -0,0 +1,105 @@
+# tiling/flow_field.py — shared pathfinding field towards the player
+# FlowField runs a breadth first search from the target tile over the walkable tiles of a blocking grid
+# The search is spread over frames under a time budget, enemies look up their direction per tile in O(1)
+import time
+from collections import deque
+
+import numpy as np
+from pygame.math import Vector2 as vec2
+
+# 8 way steps, diagonals only when both tiles beside them are walkable so nobody cuts a corner
+STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1))
+# reaching a tile through STEPS[k] means the way back to the target is DIRECTIONS[k]
+DIRECTIONS = [-vec2(step).normalize() for step in STEPS]
+TARGET = len(STEPS) + 1
+
+class FlowField:
+    """Directions towards a target tile for a `size` window of `blocking`.
+
+    The window sits at `origin` or, when that's None, is centred on the target
+    every search. A new search starts once the last one is done and the target
+    moved to another tile, until then the last finished field is used.
+    """
+    def __init__(self, blocking, size, origin=None, budget=0.002):
+        self.blocking = blocking
+        self.tile_size = blocking.tile_size
+        self.size = tuple(size)
+        self.fixed_origin = origin
+        self.budget = budget # seconds of searching per update
+
+        # the finished field
+        self.target = None
+        self.origin = (0, 0)
+        self.directions = None # bytearray, y * w + x -> index into DIRECTIONS + 1, 0 where unreached
+
+        # the search in progress
+        self.next_target = None
+        self.next_origin = None
+        self.next_directions = None
+        self.walkable = None
+        self.queue = deque()
+
+        self.searches = 0
+        self.search_time = 0 # seconds spent searching
+
+    def start(self, target):
+        w, h = self.size
+        origin = self.fixed_origin or (target[0] - w // 2, target[1] - h // 2)
+        ys, xs = np.mgrid[origin[1]:origin[1] + h, origin[0]:origin[0] + w]
+        self.walkable = bytes(~self.blocking.blocked_many(xs.ravel(), ys.ravel()))
+        self.next_target, self.next_origin = target, origin
+        self.next_directions = bytearray(w * h)
+        self.queue.clear()
+
+        x, y = target[0] - origin[0], target[1] - origin[1]
+        if 0 <= x < w and 0 <= y < h:
+            self.next_directions[y * w + x] = TARGET
+            self.queue.append(y * w + x)
+
+    def search(self):
+        start = time.perf_counter()
+        w, h = self.size
+        walkable, directions, queue = self.walkable, self.next_directions, self.queue
+        popped = 0
+        while queue:
+            popped += 1
+            if popped % 256 == 0 and time.perf_counter() - start > self.budget:
+                break
+            index = queue.popleft()
+            x, y = index % w, index // w
+            for k, (dx, dy) in enumerate(STEPS):
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < w and 0 <= ny < h):
+                    continue
+                neighbour = ny * w + nx
+                if directions[neighbour] or not walkable[neighbour]:
+                    continue
+                if dx and dy and not (walkable[y * w + nx] and walkable[ny * w + x]):
+                    continue
+                directions[neighbour] = k + 1
+                queue.append(neighbour)
+
+        if not queue: # done, swap it in
+            self.target, self.origin, self.directions = self.next_target, self.next_origin, self.next_directions
+            self.next_target = self.next_directions = self.walkable = None
+            self.searches += 1
+        self.search_time += time.perf_counter() - start
+
+    def update(self, target):
+        """Keep searching towards `target` (a tile position) for at most `budget` seconds."""
+        if self.next_target is None and target != self.target:
+            self.start(target)
+        if self.next_target is not None:
+            self.search()
+
+    def direction(self, pos):
+        """Unit vector from the pixel position `pos` along the shortest walk to the target, None off the field or on the target."""
+        if self.directions is None:
+            return None
+        x, y = int(pos[0] // self.tile_size) - self.origin[0], int(pos[1] // self.tile_size) - self.origin[1]
+        if not (0 <= x < self.size[0] and 0 <= y < self.size[1]):
+            return None
+        step = self.directions[y * self.size[0] + x]
+        if step == 0 or step == TARGET:
+            return None
+        return vec2(DIRECTIONS[step - 1])
@@ -0,0 +1,65 @@
+# tiling/parallel.py — multi-process world generation
+# WorldBuilder splits the world into chunk-aligned strips with halo rows, built in a ProcessPoolExecutor
+# Workers send back raw array bytes, the stitched result is bit-identical to building in one process
+import multiprocessing, os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.tiling.world import build_region, is_walkable, WorldLayers
+
+LAYER_ARRAYS = ('ground', 'obj', 'ground_masks', 'obj_masks', 'distance')
+
+def build_strip(seed, world_size, y, rows, halo):
+    # runs in a worker process, only plain bytes go back through the pipe
+    layers = build_region(seed, (0, y), (world_size[0], rows), world_size, halo=halo)
+    return {name: (getattr(layers, name).dtype.str, getattr(layers, name).shape, getattr(layers, name).tobytes()) for name in LAYER_ARRAYS}
+
+class WorldBuilder:
+    def __init__(self, workers=1, strip_rows=18):
+        self.workers = workers if workers > 0 else os.cpu_count() or 1
+        self.strip_rows = strip_rows # a multiple of the chunk height keeps strips chunk aligned
+        self.halo = strip_rows * 2 # coast distances up to the halo are exact inside a strip
+        self.executor = None
+
+        self.parallel = self.workers > 1
+
+    def build(self, seed, world_size):
+        """WorldLayers for the whole world."""
+        if not self.parallel:
+            return build_region(seed, (0, 0), world_size, world_size)
+
+        if self.executor is None:
+            # never forked from the game itself, pygame is already initialised in it; workers come from a
+            # clean forkserver where there is one, and only import main.py, which opens no window on import
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            self.executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context(method))
+
+        arrays = {}
+        strips = [(y, min(self.strip_rows, world_size[1] - y)) for y in range(0, world_size[1], self.strip_rows)]
+        halo = self.halo
+        while strips:
+            futures = [self.executor.submit(build_strip, seed, tuple(world_size), y, rows, halo) for y, rows in strips]
+
+            retry = []
+            for (y, rows), future in zip(strips, futures):
+                strip = future.result()
+                for name, (dtype, shape, data) in strip.items():
+                    if name not in arrays:
+                        arrays[name] = np.empty(tuple(world_size), dtype=dtype)
+                    arrays[name][:, y:y + rows] = np.frombuffer(data, dtype=dtype).reshape(shape)
+
+                # a strip cannot see coast further away than its halo, rebuild it with a bigger one
+                distance = arrays['distance'][:, y:y + rows]
+                unsure = ((distance < 0) & is_walkable(arrays['ground'][:, y:y + rows])) | (distance > halo)
+                if halo < world_size[1] and unsure.any():
+                    retry.append((y, rows))
+            strips = retry
+            halo *= 2
+
+        return WorldLayers((0, 0), *(arrays[name] for name in LAYER_ARRAYS))
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
@@ -0,0 +1,87 @@
+# tiling/streaming.py — endless world generated chunk by chunk around the camera
+# StreamingWorld builds, auto-tiles & bakes chunks on demand and evicts far away ones
+# Chunks only depend on the seed, so evicted chunks regenerate exactly the same
+import pygame
+import numpy as np
+
+from src.tiling.world import build_region, ground_shades, object_shades, is_walkable
+from src.utilities.camera import chunks_in
+from src.tiling.tilemap import TileMap, TileMapChunks, GROUND_FLAGS, OBJECT_FLAGS, BLOCKS_BULLETS, spawn_positions
+from src.tiling.collision import BlockingGrid, BlockingChunks
+
+class StreamingWorld:
+    def __init__(self, seed, island_size, chunk_size, tile_size, halo=8, keep_margin=2, chunks_per_frame=1):
+        self.seed = seed
+        self.island_size = island_size # the falloff repeats every island_size tiles
+        self.chunk_size = chunk_size
+        self.tile_size = tile_size
+        self.chunk_px = (chunk_size[0] * tile_size, chunk_size[1] * tile_size)
+
+        self.halo = halo # tiles generated past each chunk border, coast shading saturates there
+        self.keep_margin = keep_margin # chunks kept around the view before they are evicted
+        self.chunks_per_frame = chunks_per_frame # chunks generated ahead of the view per update
+
+        # shared with Game, chunk tile maps are added and removed as chunks stream in and out
+        self.ground_tiles = TileMapChunks(chunk_size)
+        self.tiles = TileMapChunks(chunk_size)
+        self.blocking = BlockingChunks(chunk_size, tile_size)
+        self.bullet_blocking = BlockingChunks(chunk_size, tile_size, void=True)
+        self.chunk_surfs = {}
+        self.chunks = self.ground_tiles.maps # chunk offsets that are generated
+
+        self.generated = 0
+        self.evicted = 0
+
+    def chunks_in(self, rect, margin=0):
+        return chunks_in(rect, self.chunk_px, margin)
+
+    def generate_chunk(self, chunk):
+        origin = (chunk[0] * self.chunk_size[0], chunk[1] * self.chunk_size[1])
+        layers = build_region(self.seed, origin, self.chunk_size, self.island_size, wrap=True, halo=self.halo)
+
+        # windowed coast distances are exact up to the halo, saturate everything past it
+        distance = np.where(layers.distance < 0, self.halo, np.minimum(layers.distance, self.halo))
+        distance[~is_walkable(layers.ground)] = -1
+
+        ground = TileMap(layers.ground, layers.ground_masks, ground_shades(distance, self.halo), self.tile_size, GROUND_FLAGS, origin)
+        tiles = TileMap(layers.obj, layers.obj_masks, object_shades(layers.obj), self.tile_size, OBJECT_FLAGS, origin)
+
+        surf = pygame.Surface(self.chunk_px, pygame.SRCALPHA).convert_alpha()
+        surf_offset = (chunk[0] * self.chunk_px[0], chunk[1] * self.chunk_px[1])
+        for layer in (ground, tiles):
+            layer.draw(surf, surf_offset) # air tiles are skipped
+        
+        self.ground_tiles.maps[chunk] = ground
+        self.tiles.maps[chunk] = tiles
+        self.blocking.grids[chunk] = BlockingGrid(ground, tiles)
+        self.bullet_blocking.grids[chunk] = BlockingGrid(ground, tiles, BLOCKS_BULLETS, void=True)
+        self.chunk_surfs[chunk] = surf
+        self.generated += 1
+
+    def evict_chunk(self, chunk):
+        del self.ground_tiles.maps[chunk]
+        del self.tiles.maps[chunk]
+        del self.blocking.grids[chunk]
+        del self.bullet_blocking.grids[chunk]
+        self.chunk_surfs.pop(chunk, None)
+        self.evicted += 1
+
+    def spawn_area(self):
+        return [pos for chunk, ground in self.ground_tiles.maps.items() for pos in spawn_positions(ground, self.tiles.maps[chunk])]
+
+    def update(self, view_rect):
+        # whatever is on screen has to exist this frame
+        for chunk in self.chunks_in(view_rect):
+            if chunk not in self.chunks:
+                self.generate_chunk(chunk)
+
+        # the ring around the view is generated a few chunks per frame, nearest first
+        center = (view_rect.centerx / self.chunk_px[0] - 0.5, view_rect.centery / self.chunk_px[1] - 0.5)
+        pending = [chunk for chunk in self.chunks_in(view_rect, 1) if chunk not in self.chunks]
+        pending.sort(key=lambda chunk: (chunk[0] - center[0])**2 + (chunk[1] - center[1])**2)
+        for chunk in pending[:self.chunks_per_frame]:
+            self.generate_chunk(chunk)
+
+        keep = set(self.chunks_in(view_rect, self.keep_margin))
+        for chunk in [chunk for chunk in self.chunks if chunk not in keep]:
+            self.evict_chunk(chunk)
@@ -1,34 +1,167 @@
 # tiling/terrain.py — procedural terrain generation helpers
-# generate_world_data returns noise-based dict mapping positions to tile types
-# Utilised by Game.load() to build ground & object layers
-import noise
-import math
+# generate_world_grid builds noise, falloff & tile types as whole NumPy arrays
+# NoiseFieldCache shares one noise evaluation between layers, generate_world_data is the old dict adapter
+import threading
+from functools import lru_cache
+
+import numpy as np
+from noise.perlin import BaseNoise
+
+from src.utilities.lru import ByteLRU
+
+# tile type codes used by the array based grids, index == code
+TILE_TYPES = ('air', 'dirt', 'dirt2', 'edge')
+AIR, DIRT, DIRT2, EDGE = range(len(TILE_TYPES))
+TILE_CODES = {name: code for code, name in enumerate(TILE_TYPES)}
+
+# same permutation / gradient tables as noise.pnoise2 (Ken Perlin's improved noise)
+# the C table differs from the pure python one in one entry, and with base > 0 noise2() reads past
+# its 512 entries into the GRAD4 table compiled right after it, as bytes of its floats
+PERMUTATION = list(BaseNoise.permutation[:256]) # already doubled there
+PERMUTATION[180] = 19
+GRAD4 = np.array([(0, 1, 1, 1), (0, 1, 1, -1), (0, 1, -1, 1), (0, 1, -1, -1),
+                  (0, -1, 1, 1), (0, -1, 1, -1), (0, -1, -1, 1), (0, -1, -1, -1),
+                  (1, 0, 1, 1), (1, 0, 1, -1), (1, 0, -1, 1), (1, 0, -1, -1),
+                  (-1, 0, 1, 1), (-1, 0, 1, -1), (-1, 0, -1, 1), (-1, 0, -1, -1)], dtype='<f4')
+# indices reach (i & 255) + 255 + base, 766 with the largest base of 256
+PERM = np.concatenate([PERMUTATION * 2, np.frombuffer(GRAD4.tobytes(), dtype=np.uint8)[:255]]).astype(np.int32)
+GRAD2 = np.array([(1, 1), (-1, 1), (1, -1), (-1, -1),
+                  (1, 0), (-1, 0), (1, 0), (-1, 0),
+                  (0, 1), (0, -1), (0, 1), (0, -1),
+                  (1, 0), (-1, 0), (0, -1), (0, 1)], dtype=np.float32)
+# gradient x/y components looked up straight from a hash: GRAD_X[h] == GRAD2[PERM[h] & 15][0]
+GRAD_X = GRAD2[PERM & 15, 0]
+GRAD_Y = GRAD2[PERM & 15, 1]
+
+def _lattice(coords, repeat, base):
+    # per axis lattice cell, wrapped neighbour cell and fade curve, mirrors noise2() in noise/_perlin.c
+    i = np.floor(np.fmod(coords, repeat)).astype(np.int32)
+    ii = np.fmod(i + 1, repeat).astype(np.int32)
+    coords = coords - np.floor(coords)
+    fade = coords * coords * coords * (coords * (coords * np.float32(6) - np.float32(15)) + np.float32(10))
+    return (i & 255) + base, (ii & 255) + base, coords, fade
+
+def _noise2(x, y, repeat, base):
+    # single octave of improved perlin noise, x is a column vector and y a row vector
+    i, ii, x, fx = _lattice(x, repeat, base)
+    j, jj, y, fy = _lattice(y, repeat, base)
+    one = np.float32(1)
+
+    A, B = PERM[i][:, None], PERM[ii][:, None]
+    x, y = x[:, None], y[None, :]
+
+    def grad(h, gx, gy):
+        return gx * GRAD_X[h] + gy * GRAD_Y[h]
+
+    g_aa = grad(PERM[A + j], x, y)
+    g_ab = grad(PERM[A + jj], x, y - one)
+    x1 = g_aa + fx[:, None] * (grad(PERM[B + j], x - one, y) - g_aa)
+    x2 = g_ab + fx[:, None] * (grad(PERM[B + jj], x - one, y - one) - g_ab)
+    return x1 + fy[None, :] * (x2 - x1)
+
+def perlin_grid(origin, size, frequency=(0.05, 0.08), octaves=2, persistence=0.5, base=0):
+    """Fractal perlin noise for every tile of a (w, h) window, indexed [x, y]."""
+    x = (np.arange(origin[0], origin[0] + size[0], dtype=np.float64) * frequency[0]).astype(np.float32)
+    y = (np.arange(origin[1], origin[1] + size[1], dtype=np.float64) * frequency[1]).astype(np.float32)
+
+    freq, amp = np.float32(1), np.float32(1)
+    total, max_amp = np.zeros((size[0], size[1]), dtype=np.float32), np.float32(0)
+    for _ in range(octaves):
+        total += _noise2(x * freq, y * freq, np.float32(1024) * freq, base) * amp
+        max_amp += amp
+        freq *= np.float32(2)
+        amp *= np.float32(persistence)
+    return total / max_amp
+
+def falloff_grid(origin, size, world_size):
+    """Radial falloff (0 at the world center, 1.6 at the corners) for a window of the world."""
+    center_x, center_y = world_size[0] // 2, world_size[1] // 2
+    max_distance = np.sqrt(center_x ** 2 + center_y ** 2)
+
+    dx = np.arange(origin[0], origin[0] + size[0], dtype=np.float64) - center_x
+    dy = np.arange(origin[1], origin[1] + size[1], dtype=np.float64) - center_y
+    t = np.sqrt(dx[:, None] ** 2 + dy[None, :] ** 2) / max_distance
+    return (1 - np.cos(t * np.pi)) * 0.8
+
+@lru_cache(maxsize=4)
+def world_falloff(world_size:tuple):
+    # computed once per world size and sliced, so any window gets bit-identical values
+    falloff = falloff_grid((0, 0), world_size, world_size)
+    falloff.flags.writeable = False
+    return falloff
+
+def window_values(seed, origin, size, world_size, wrap=False, frequency=(0.05, 0.08), octaves=2, persistence=0.5):
+    """Falloff adjusted noise values for a (w, h) window anywhere in the world.
+
+    With `wrap` the falloff repeats every `world_size` tiles, giving an endless
+    archipelago, otherwise cells outside the world reuse the nearest border falloff.
+    """
+    values = perlin_grid(origin, size, frequency, octaves, persistence, seed).astype(np.float64)
+    xs = np.arange(origin[0], origin[0] + size[0])
+    ys = np.arange(origin[1], origin[1] + size[1])
+    if wrap:
+        xs, ys = xs % world_size[0], ys % world_size[1]
+    else:
+        xs, ys = xs.clip(0, world_size[0] - 1), ys.clip(0, world_size[1] - 1)
+    return values - world_falloff(tuple(world_size))[np.ix_(xs, ys)]
+
+def world_values(world_size, seed, frequency=(0.05, 0.08), octaves=2, persistence=0.5):
+    """Falloff adjusted noise value for every tile of the world as a float64 (w, h) array."""
+    return window_values(seed, (0, 0), world_size, world_size, False, frequency, octaves, persistence)
+
+def classify(values, terrain_data:dict):
+    """Map values to tile type codes, first matching (low, high) range wins and anything else is air."""
+    conditions = [(low <= values) & (values <= high) for low, high in terrain_data]
+    codes = [TILE_CODES[terrain_type] for terrain_type in terrain_data.values()]
+    return np.select(conditions, codes, AIR).astype(np.uint8)
+
+class NoiseFieldCache:
+    """LRU cache of falloff adjusted value fields, bounded by the total bytes held.
+
+    Layers only differ by their threshold table, so every layer of a world
+    (ground, objects, decorations...) classifies the same cached field.
+    Worlds are prebuilt on another thread, so lookups take `lock`.
+    """
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.fields = ByteLRU(max_bytes, lambda values: values.nbytes)
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def field(self, world_size, seed, frequency=(0.05, 0.08), octaves=2, persistence=0.5):
+        key = (seed, tuple(world_size), tuple(frequency), octaves, persistence)
+        # held while a missing field is computed too, so two threads never compute the same one
+        with self.lock:
+            values = self.fields.get(key)
+            if values is not None:
+                self.hits += 1
+                return values
+
+            self.misses += 1
+            values = world_values(world_size, seed, frequency, octaves, persistence)
+            values.flags.writeable = False # shared between callers
+            return self.fields.put(key, values)
+
+    def classify(self, world_size, seed, *terrain_tables, **noise_params):
+        """Classify one cached field with every threshold table, returns one grid per table."""
+        values = self.field(world_size, seed, **noise_params)
+        return [classify(values, terrain_data) for terrain_data in terrain_tables]
+
+    def clear(self):
+        with self.lock:
+            self.fields.clear()
+
+noise_fields = NoiseFieldCache()
+
+def generate_world_grid(world_size, terrain_data:dict, seed):
+    """Return a (w, h) uint8 grid of tile type codes (see TILE_TYPES)."""
+    return classify(noise_fields.field(world_size, seed), terrain_data)
+
+def grid_to_dict(grid):
+    columns = np.array(TILE_TYPES, dtype=object)[grid].tolist()
+    return {(x, y): columns[x][y] for y in range(grid.shape[1]) for x in range(grid.shape[0])}
 
 def generate_world_data(world_size, terrain_data:dict, seed):
-    tiles = {}
-    center_x, center_y = world_size[0] // 2, world_size[1] // 2  # Center of the map
-    max_distance = math.sqrt(center_x ** 2 + center_y ** 2)  # Max possible distance from center
-
-    for y in range(world_size[1]):
-        for x in range(world_size[0]):
-            # Generate Perlin noise
-            value = noise.pnoise2(x * 0.05, y * 0.08, octaves=2, persistence=0.5, base=seed)
-
-            # Calculate falloff factor (0 at center, 1 at edges)
-            dx, dy = x - center_x, y - center_y
-            distance = math.sqrt(dx**2 + dy**2)
-            t = distance / max_distance
-            falloff = (1 - math.cos(t * math.pi)) * 0.8
-
-            # Apply falloff (reduces terrain values near edges)
-            value -= falloff  
-
-            # Determine terrain type
-            terrain_type = 'air'
-            for data in terrain_data:
-                if data[0] <= value <= data[1]:
-                    terrain_type = terrain_data[data]
-                    break
-            tiles[(x, y)] = terrain_type
-    
-    return tiles
+    # dict based adapter kept for callers that still key tiles by position
+    return grid_to_dict(generate_world_grid(world_size, terrain_data, seed))
@@ -1,16 +1,26 @@
 # tiling/tile.py — Tile class for world grid rendering
 # Contains sprite for dirt/dirt2/edge types, draw skipping for air, and outline coloring
-# Used by Game.load() and chunk surfaces
+# TileAtlas bakes every (type, autotile mask, shade) tile once, TileMaps blit from it & hand out Tile views
+from functools import lru_cache
+
+import numpy as np
 import pygame
 
+from src.tiling.terrain import TILE_TYPES
+from src.tiling.world import NEIGHBOR_BITS, SHADES, VOID
+
 class Tile:
-    def __init__(self, tile_type, tile_size, pos):
+    def __init__(self, tile_type, tile_size, pos, image=None):
         self.tile_type = tile_type
         self.tile_size = tile_size
         self.pos = pos[0] * self.tile_size, pos[1] * self.tile_size
+        self.rect = pygame.Rect(self.pos, (self.tile_size, self.tile_size))
+
+        if image is not None: # shared variant image, never draw onto it
+            self.image = image
+            return
 
         self.image = pygame.Surface((self.tile_size, self.tile_size), pygame.SRCALPHA).convert_alpha()
-        self.rect = self.image.get_rect(topleft=self.pos)
 
         # Dusk-purple island palette that contrasts well with white outlines
         if self.tile_type == 'dirt':
@@ -33,9 +43,9 @@ class Tile:
 
         draw_surf.blit(self.image, (render_x, render_y))
 
-def auto_tile(tiles, tile_size):
-    tiles = tiles.copy()
-    AUTOTILE_MAP = {
+@lru_cache(maxsize=4)
+def autotile_map(tile_size):
+    return {
         # rects which will render on the image so that they will show the edge highlights
         tuple(sorted([(0, 1), (1, 0)])): [(0, 0, tile_size, tile_size/8), (0, 0, tile_size/8, tile_size)], # topleft
         tuple(sorted([(0, 1), (1, 0), (-1, 0)])): [(0, 0, tile_size, tile_size/8)], # middletop
@@ -63,25 +73,47 @@ def auto_tile(tiles, tile_size):
         (): [(0, 0, tile_size, tile_size/8), (0, 0, tile_size/8, tile_size), (tile_size - tile_size/8, 0, tile_size/8, tile_size), (0, tile_size - tile_size/8, tile_size, tile_size/8)], # single
     }
 
-    for pos in tiles:
-        if tiles[pos].tile_type not in ['dirt', 'dirt2']:
-            continue
-        try:
-            neighbors = set()
+def mask_neighbors(mask):
+    # autotile bitmask -> the sorted neighbour tuple used as AUTOTILE_MAP key
+    return tuple(sorted(shift for bit, shift in enumerate(NEIGHBOR_BITS) if mask >> bit & 1))
 
-            for shift in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                new_offset = (pos[0] + shift[0], pos[1] + shift[1])
+class TileAtlas:
+    """One surface holding every tile image: tile type x autotile mask (-1..15) x shade (-1 keeps the palette).
 
-                if tiles[new_offset].tile_type in ['dirt', 'dirt2']:
-                    neighbors.add(shift)
-            
-            neighbors = tuple(sorted(neighbors))
+    Cells are laid out one mask per column, `rects[entry]` is the area of an
+    entry on `surface` and `images[entry]` a subsurface of it for Tile views.
+    """
+    MASKS = 2 ** len(NEIGHBOR_BITS) + 1
 
-            if neighbors in AUTOTILE_MAP:
-                for rect in AUTOTILE_MAP[neighbors]:
-                    pygame.draw.rect(tiles[pos].image, 'white', rect)
-    
-        except KeyError:
-            pass
-        
-    return tiles
+    def __init__(self, tile_size):
+        self.tile_size = tile_size
+        rows = (len(SHADES) + 1) * len(TILE_TYPES)
+        self.surface = pygame.Surface((self.MASKS * tile_size, rows * tile_size), pygame.SRCALPHA).convert_alpha()
+
+        AUTOTILE_MAP = autotile_map(tile_size)
+        self.rects, self.images = [], []
+        for row in range(rows):
+            shade, code = row // len(TILE_TYPES) - 1, row % len(TILE_TYPES)
+            for mask in range(-1, self.MASKS - 1):
+                image = Tile(TILE_TYPES[code], tile_size, (0, 0)).image
+                if shade >= 0:
+                    image.fill(SHADES[shade])
+                if mask >= 0:
+                    for rect in AUTOTILE_MAP[mask_neighbors(mask)]:
+                        pygame.draw.rect(image, 'white', rect)
+
+                rect = image.get_rect(topleft=((mask + 1) * tile_size, row * tile_size))
+                self.surface.blit(image, rect)
+                self.rects.append(rect)
+                self.images.append(self.surface.subsurface(rect))
+
+    def entries(self, codes, masks, shades):
+        """Atlas entry of every tile in the grids, -1 for VOID cells."""
+        entries = ((shades.astype(np.int32) + 1) * len(TILE_TYPES) + codes) * self.MASKS + masks + 1
+        entries[codes == VOID] = -1
+        return entries
+
+@lru_cache(maxsize=4)
+def tile_atlas(tile_size):
+    # one atlas per tile size, shared by every world and layer
+    return TileAtlas(tile_size)
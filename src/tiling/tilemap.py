@@ -0,0 +1,171 @@
+# tiling/tilemap.py — array backed tile layers
+# TileMap keeps type codes, bit flags & a tile atlas entry per tile, no tile owns a Surface
+# Indexing by tile position returns a Tile view so dict style callers (bullets, entity collisions) keep working
+from itertools import chain
+
+import numpy as np
+import pygame
+
+from src.tiling.terrain import TILE_TYPES, AIR, DIRT, DIRT2, EDGE
+from src.tiling.world import VOID
+from src.tiling.tile import Tile, tile_atlas
+
+# tile flags, a layer's flag table says which tile types get which
+BLOCKS_MOVEMENT = 1
+BLOCKS_BULLETS = 2
+OPEN = 4 # nothing in the way, ground you can stand on or an empty object tile
+
+# the ground stops you at the coast (air & edge), the object layer where there is dirt
+GROUND_FLAGS = {AIR: BLOCKS_MOVEMENT, EDGE: BLOCKS_MOVEMENT, DIRT: OPEN, DIRT2: OPEN}
+OBJECT_FLAGS = {AIR: OPEN, EDGE: OPEN, DIRT: BLOCKS_MOVEMENT | BLOCKS_BULLETS, DIRT2: BLOCKS_MOVEMENT | BLOCKS_BULLETS}
+
+def flag_lookup(flag_table):
+    lookup = np.zeros(256, dtype=np.uint8) # VOID and unknown codes have no flags
+    for code, flags in flag_table.items():
+        lookup[code] = flags
+    return lookup
+
+class TileMap:
+    """One tile layer for a (w, h) window at tile offset `origin`, indexed [x, y] like the world grids.
+
+    `masks` holds autotile neighbour bitmasks (-1 for no outline), `shades`
+    per tile indices into SHADES (-1 keeps the palette) and VOID cells hold no tile.
+    """
+    def __init__(self, codes, masks, shades, tile_size, flag_table, origin=(0, 0)):
+        self.codes = codes
+        self.flags = flag_lookup(flag_table)[codes]
+        self.atlas = tile_atlas(tile_size)
+        self.entries = self.atlas.entries(codes, masks, shades)
+        self.tile_size = tile_size
+        self.origin = tuple(origin)
+        self.size = codes.shape
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.flags.nbytes + self.entries.nbytes
+
+    def index(self, pos):
+        x, y = pos[0] - self.origin[0], pos[1] - self.origin[1]
+        if 0 <= x < self.size[0] and 0 <= y < self.size[1] and self.codes[x, y] != VOID:
+            return x, y
+        return None
+
+    def code_at(self, pos):
+        index = self.index(pos)
+        return VOID if index is None else int(self.codes[index])
+
+    def flags_at(self, pos):
+        index = self.index(pos)
+        return 0 if index is None else int(self.flags[index])
+
+    def get(self, pos, default=None):
+        index = self.index(pos)
+        if index is None:
+            return default
+        return Tile(TILE_TYPES[self.codes[index]], self.tile_size, pos, self.atlas.images[self.entries[index]])
+
+    def __getitem__(self, pos):
+        tile = self.get(pos)
+        if tile is None:
+            raise KeyError(pos)
+        return tile
+
+    def __contains__(self, pos):
+        return self.index(pos) is not None
+
+    def positions(self, mask=None):
+        """Tile positions where `mask` (default: every tile) is set, row by row like the old tile dicts."""
+        mask = self.codes != VOID if mask is None else mask
+        ys, xs = np.nonzero(mask.T)
+        return list(zip((xs + self.origin[0]).tolist(), (ys + self.origin[1]).tolist()))
+
+    def __iter__(self):
+        return iter(self.positions())
+
+    def __len__(self):
+        return int(np.count_nonzero(self.codes != VOID))
+
+    def keys(self):
+        return self.positions()
+
+    def values(self):
+        return [self[pos] for pos in self.positions()]
+
+    def items(self):
+        return [(pos, self[pos]) for pos in self.positions()]
+
+    def drawn(self):
+        # air tiles are transparent and never drawn
+        return (self.codes != VOID) & (self.codes != AIR)
+
+    def chunks(self, chunk_size):
+        """Chunk offsets that hold at least one drawn tile."""
+        xs, ys = np.nonzero(self.drawn())
+        offsets = np.unique(np.stack([(xs + self.origin[0]) // chunk_size[0], (ys + self.origin[1]) // chunk_size[1]], axis=1), axis=0)
+        return [tuple(offset) for offset in offsets.tolist()]
+
+    def draw(self, draw_surf, camera_offset, area=None):
+        """Blit every drawn tile (inside the tile rect `area` if given) from the atlas in one Surface.blits call."""
+        x0, y0, x1, y1 = 0, 0, self.size[0], self.size[1]
+        if area is not None:
+            x0, y0 = max(area[0] - self.origin[0], 0), max(area[1] - self.origin[1], 0)
+            x1, y1 = min(area[0] + area[2] - self.origin[0], x1), min(area[1] + area[3] - self.origin[1], y1)
+            if x0 >= x1 or y0 >= y1:
+                return
+
+        xs, ys = np.nonzero(self.drawn()[x0:x1, y0:y1])
+        entries = self.entries[xs + x0, ys + y0].tolist()
+        px = ((xs + x0 + self.origin[0]) * self.tile_size - camera_offset[0]).tolist()
+        py = ((ys + y0 + self.origin[1]) * self.tile_size - camera_offset[1]).tolist()
+        atlas, rects = self.atlas.surface, self.atlas.rects
+        draw_surf.blits([(atlas, (x, y), rects[entry]) for entry, x, y in zip(entries, px, py)], False)
+
+class TileMapChunks:
+    """The TileMaps of streamed chunks behind the same positional lookups as one TileMap."""
+    def __init__(self, chunk_size):
+        self.chunk_size = chunk_size
+        self.maps = {} # chunk offset -> TileMap
+
+    def map_at(self, pos):
+        return self.maps.get((pos[0] // self.chunk_size[0], pos[1] // self.chunk_size[1]))
+
+    def code_at(self, pos):
+        tilemap = self.map_at(pos)
+        return VOID if tilemap is None else tilemap.code_at(pos)
+
+    def flags_at(self, pos):
+        tilemap = self.map_at(pos)
+        return 0 if tilemap is None else tilemap.flags_at(pos)
+
+    def get(self, pos, default=None):
+        tilemap = self.map_at(pos)
+        return default if tilemap is None else tilemap.get(pos, default)
+
+    def __getitem__(self, pos):
+        tile = self.get(pos)
+        if tile is None:
+            raise KeyError(pos)
+        return tile
+
+    def __contains__(self, pos):
+        tilemap = self.map_at(pos)
+        return tilemap is not None and pos in tilemap
+
+    def __iter__(self):
+        return chain.from_iterable(self.maps.values())
+
+    def __len__(self):
+        return sum(len(tilemap) for tilemap in self.maps.values())
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [tile for tilemap in self.maps.values() for tile in tilemap.values()]
+
+    def items(self):
+        return [item for tilemap in self.maps.values() for item in tilemap.items()]
+
+def spawn_positions(ground, objects):
+    """Positions with open ground and no object in the way, for one pair of TileMaps."""
+    return ground.positions((ground.flags & objects.flags & OPEN).astype(bool))
@@ -0,0 +1,169 @@
+# tiling/world.py — array based world building shared by the eager and streaming worlds
+# build_region turns any window of the world into tile layers, autotile masks & coast distance
+# Cells outside the world are VOID so the air/edge and outline rules match across chunk borders
+import numpy as np
+
+from src.tiling.terrain import noise_fields, classify, window_values, AIR, DIRT, DIRT2, EDGE
+
+# bump whenever generated layers or the world file layout change, cached worlds of other versions are dropped
+GENERATOR_VERSION = 5
+
+VOID = 255 # outside of the world, the old "position not in data" case
+
+TERRAIN_DATA = {(-0.3, 1): 'dirt', (-0.5, -0.3): 'dirt2', (-1, -0.5): 'air'} # map data
+TILE_DATA = {(0.2, 1): 'dirt', (0, 0.2): 'dirt2', (-1, 0): 'air'} # tile data
+
+GROUND_COLOUR = (150, 100, 230) # core purple, shaded by distance from the coast
+OBJECT_COLOUR = (40, 20, 80) # uniform darker purple so background is consistent
+# tile fills baked into the tile atlas: SHADE_LEVELS ground steps from dark to bright, then the object colour
+SHADE_LEVELS = 32
+SHADES = tuple(tuple(int(c * (0.6 + 0.4 * level / (SHADE_LEVELS - 1))) for c in GROUND_COLOUR) for level in range(SHADE_LEVELS)) + (OBJECT_COLOUR,)
+OBJECT_SHADE = SHADE_LEVELS
+
+OCEAN_COLOURS = ((64, 209, 225), (15, 47, 112), (0, 0, 0)) # radial, light aqua -> deep blue -> near-black
+
+# autotile neighbour bits: up, right, down, left
+NEIGHBOR_BITS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+class WorldLayers:
+    def __init__(self, origin, ground, obj, ground_masks, obj_masks, distance):
+        self.origin = tuple(origin)
+        self.ground = ground # (w, h) type codes after the air/edge rules
+        self.obj = obj
+        self.ground_masks = ground_masks # autotile neighbour masks, -1 means no outline
+        self.obj_masks = obj_masks
+        self.distance = distance # tiles from the coast for walkable ground, -1 elsewhere
+        self.max_distance = int(distance.max()) if distance.size else 0
+
+def shifted(grid, dx, dy, fill=VOID):
+    """out[x, y] == grid[x + dx, y + dy], `fill` where that falls outside the grid."""
+    out = np.full_like(grid, fill)
+    w, h = grid.shape
+    out[max(0, -dx):w - max(0, dx), max(0, -dy):h - max(0, dy)] = grid[max(0, dx):w - max(0, -dx), max(0, dy):h - max(0, -dy)]
+    return out
+
+def is_dirt(codes):
+    return (codes == DIRT) | (codes == DIRT2)
+
+def is_walkable(codes):
+    return is_dirt(codes) | (codes == EDGE)
+
+def sample_layers(seed, origin, size, world_size, wrap=False):
+    """Classified ground and object codes for a window, VOID outside a bounded world."""
+    if wrap:
+        values = window_values(seed, origin, size, world_size, True)
+        return classify(values, TERRAIN_DATA), classify(values, TILE_DATA)
+
+    ground = np.full(size, VOID, dtype=np.uint8)
+    obj = np.full(size, VOID, dtype=np.uint8)
+
+    # part of the window that lies inside the world
+    x0, y0 = max(origin[0], 0), max(origin[1], 0)
+    x1, y1 = min(origin[0] + size[0], world_size[0]), min(origin[1] + size[1], world_size[1])
+    if x0 >= x1 or y0 >= y1:
+        return ground, obj
+
+    if (x0, y0, x1, y1) == (0, 0, world_size[0], world_size[1]):
+        values = noise_fields.field(world_size, seed) # whole world, shared with every other layer
+    else:
+        values = window_values(seed, (x0, y0), (x1 - x0, y1 - y0), world_size)
+
+    inner = (slice(x0 - origin[0], x1 - origin[0]), slice(y0 - origin[1], y1 - origin[1]))
+    ground[inner] = classify(values, TERRAIN_DATA)
+    obj[inner] = classify(values, TILE_DATA)
+    return ground, obj
+
+def apply_layer_rules(codes):
+    """Turn dirt into air/edge tiles depending on what is above and below them.
+
+    Rows at the window border see VOID past it, so pass one extra row of halo.
+    """
+    above = shifted(codes, 0, -1)
+    below = shifted(codes, 0, 1)
+    dirt = is_dirt(codes)
+
+    out = codes.copy()
+    # no tile (void | out of world) on top of current tile
+    out[dirt & (above == VOID)] = AIR
+    # nothing or air underneath: edge tile if there is dirt above, otherwise air
+    hanging = dirt & (above != VOID) & ((below == VOID) | (below == AIR))
+    out[hanging] = np.where(is_dirt(above[hanging]), EDGE, AIR)
+    return out
+
+def autotile_masks(codes):
+    """Neighbour bitmask (see NEIGHBOR_BITS) of every dirt tile, -1 for other tiles.
+
+    Like auto_tile, a dirt tile with any neighbour outside the world gets no outline.
+    """
+    masks = np.zeros(codes.shape, dtype=np.int8)
+    missing = np.zeros(codes.shape, dtype=bool)
+    for bit, (dx, dy) in enumerate(NEIGHBOR_BITS):
+        neighbor = shifted(codes, dx, dy)
+        masks |= (is_dirt(neighbor) << bit).astype(np.int8)
+        missing |= neighbor == VOID
+    masks[~is_dirt(codes) | missing] = -1
+    return masks
+
+def l1_transform(seeds, axis):
+    """Exact 1D city block distance transform along `axis`: out[i] = min_j(seeds[j] + |i - j|).
+
+    The forward and backward chamfer passes are each one cumulative minimum.
+    """
+    i = np.arange(seeds.shape[axis]).reshape((-1, 1) if axis == 0 else (1, -1))
+    forward = np.minimum.accumulate(seeds - i, axis=axis) + i
+    backward = np.flip(np.minimum.accumulate(np.flip(seeds + i, axis), axis=axis), axis) - i
+    return np.minimum(forward, backward)
+
+def outline_distance(ground):
+    """4-neighbour distance of every walkable tile from the coast outline, -1 for other tiles.
+
+    VOID counts as coast, cells past the window border do not, so a windowed
+    result is exact for every tile closer to the coast than to the border.
+    Every walkable tile next to a non-walkable one is outline itself, so the
+    unconstrained city block distance equals the BFS distance over walkable tiles.
+    """
+    walkable = is_walkable(ground)
+
+    outline = np.zeros(ground.shape, dtype=bool)
+    for dx, dy in NEIGHBOR_BITS:
+        outline |= walkable & ~shifted(walkable, dx, dy, True)
+
+    far = sum(ground.shape) # further than any tile of the window
+    distance = l1_transform(l1_transform(np.where(outline, 0, far), 0), 1).astype(np.int32)
+    distance[~walkable | (distance >= far)] = -1
+    return distance
+
+def build_region(seed, origin, size, world_size, wrap=False, halo=1):
+    """Build every layer for the (w, h) window at tile `origin`.
+
+    `halo` extra tiles are generated around the window so neighbour lookups
+    across its border see real tiles, coast distances are exact up to `halo`.
+    """
+    pad = halo + 1 # one more row for the air/edge rules
+    ground, obj = sample_layers(seed, (origin[0] - pad, origin[1] - pad), (size[0] + pad * 2, size[1] + pad * 2), world_size, wrap)
+
+    ground = apply_layer_rules(ground)[1:-1, 1:-1]
+    obj = apply_layer_rules(obj)[1:-1, 1:-1]
+
+    core = (slice(halo, halo + size[0]), slice(halo, halo + size[1]))
+    return WorldLayers(origin, ground[core], obj[core],
+                       autotile_masks(ground)[core], autotile_masks(obj)[core],
+                       outline_distance(ground)[core])
+
+def ground_colours(distance, max_distance, darkest=0.6):
+    """Per tile RGB for walkable ground shaded by coast distance, -1 where the palette is kept."""
+    t = distance / max_distance if max_distance else np.ones(distance.shape)
+    brightness = darkest + 0.4 * t
+    colours = (np.array(GROUND_COLOUR) * brightness[..., None]).astype(np.int16)
+    colours[distance < 0] = -1
+    return colours
+
+def ground_shades(distance, max_distance):
+    """Per tile index into SHADES for walkable ground shaded by coast distance, -1 where the palette is kept."""
+    t = distance / max_distance if max_distance else np.ones(distance.shape)
+    shades = np.rint(t * (SHADE_LEVELS - 1)).astype(np.int16)
+    shades[distance < 0] = -1
+    return shades
+
+def object_shades(obj):
+    return np.where(is_walkable(obj), OBJECT_SHADE, -1).astype(np.int16)
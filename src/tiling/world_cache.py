@@ -0,0 +1,123 @@
+# tiling/world_cache.py — on-disk cache of generated worlds
+# Stores the layer grids, autotile masks & coast distance in one flat binary file
+# Cached worlds are memory-mapped back, the layer arrays point straight into the mapping
+# Best effort: a directory that can't be written, or files another instance removed, just mean misses
+import json, os
+
+import numpy as np
+
+from src.tiling.world import WorldLayers, GENERATOR_VERSION
+
+MAGIC = b'ABYSSWLD'
+HEADER_SIZE = 4096 # magic, header length and the json header, arrays follow
+ALIGN = 64 # every array starts on a 64 byte boundary
+LAYER_ARRAYS = ('ground', 'obj', 'ground_masks', 'obj_masks', 'distance')
+
+def default_directory():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'escape-from-the-abyss', 'worlds')
+
+class WorldCache:
+    def __init__(self, directory=None, max_worlds=32):
+        self.directory = directory or os.environ.get('ABYSS_WORLD_CACHE') or default_directory()
+        self.max_worlds = max_worlds # ~150 KB each at the default world size
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0 # worlds that couldn't be stored
+
+    def path(self, seed, world_size):
+        name = f'v{GENERATOR_VERSION}-s{seed}-{world_size[0]}x{world_size[1]}.world'
+        return os.path.join(self.directory, name)
+
+    def load(self, seed, world_size):
+        """WorldLayers mapped from disk, or None on a miss."""
+        path = self.path(seed, world_size)
+        try:
+            # copy-on-write mapping: nothing is read until used and nothing is ever written back
+            data = np.memmap(path, dtype=np.uint8, mode='c')
+            if bytes(data[:len(MAGIC)]) != MAGIC:
+                raise ValueError('not a world file')
+            header_len = int(data[len(MAGIC):len(MAGIC) + 4].view('<u4')[0])
+            header = json.loads(bytes(data[len(MAGIC) + 4:len(MAGIC) + 4 + header_len]))
+            if header['version'] != GENERATOR_VERSION:
+                raise ValueError('stale world file')
+
+            arrays = {}
+            for name, (dtype, shape, offset) in header['arrays'].items():
+                size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+                arrays[name] = data[offset:offset + size].view(dtype).reshape(shape)
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path) # most recently used worlds survive pruning
+        except OSError:
+            pass
+
+        self.hits += 1
+        return WorldLayers((0, 0), *(arrays[name] for name in LAYER_ARRAYS))
+
+    def store(self, seed, world_size, layers):
+        """Write `layers` for the next load(), False when the directory can't take it."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self.prune()
+            self.write(self.path(seed, world_size), seed, world_size, layers)
+        except OSError:
+            self.errors += 1
+            return False
+        return True
+
+    def write(self, path, seed, world_size, layers):
+
+        arrays = {name: np.ascontiguousarray(getattr(layers, name)) for name in LAYER_ARRAYS}
+
+        table, offset = {}, HEADER_SIZE
+        for name, array in arrays.items():
+            table[name] = [array.dtype.str, list(array.shape), offset]
+            offset += -(-array.nbytes // ALIGN) * ALIGN
+        header = {'version': GENERATOR_VERSION, 'seed': seed, 'world_size': list(world_size), 'arrays': table}
+        header_bytes = json.dumps(header).encode()
+
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(MAGIC + np.uint32(len(header_bytes)).astype('<u4').tobytes() + header_bytes)
+                for name, array in arrays.items():
+                    f.seek(table[name][2])
+                    f.write(array.tobytes())
+                f.truncate(offset)
+            os.replace(tmp_path, path) # never leave a half written world behind
+        except OSError:
+            remove(tmp_path)
+            raise
+
+    def prune(self):
+        # worlds made by another generator version can never be hit again
+        worlds = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not name.endswith('.world'):
+                continue
+            if name.startswith(f'v{GENERATOR_VERSION}-'):
+                worlds.append((mtime(path), path))
+            else:
+                remove(path)
+
+        # make room for the world about to be stored, least recently used first
+        worlds.sort()
+        for _, path in worlds[:max(0, len(worlds) - self.max_worlds + 1)]:
+            remove(path)
+
+def mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError: # removed by another instance meanwhile
+        return 0
+
+def remove(path):
+    # gone already (another instance pruned it) or still mapped (Windows won't delete it), either way leave it
+    try:
+        os.remove(path)
+    except OSError:
+        pass
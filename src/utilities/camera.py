@@ -1,11 +1,51 @@
 # utilities/camera.py — smooth camera with gap and shake effects
 # Calculates scroll offset based on player position & mouse aiming
-# Also supports screen-shake and camera transitions
+# Also supports screen-shake and camera transitions, View answers what the camera sees this frame
 import random, math
 import pygame
 
 vec2 = pygame.math.Vector2
 
+def chunks_in(rect, chunk_px, margin=0):
+    """Chunk offsets overlapping a pixel rect, grown by `margin` chunks on every side."""
+    return [(cx, cy)
+            for cy in range(rect.top // chunk_px[1] - margin, (rect.bottom - 1) // chunk_px[1] + margin + 1)
+            for cx in range(rect.left // chunk_px[0] - margin, (rect.right - 1) // chunk_px[0] + margin + 1)]
+
+class View:
+    """World pixel rect the camera shows, gap & shake included, and visibility queries against it."""
+    def __init__(self, offset, size, previous=None):
+        self.offset = offset
+        self.rect = pygame.Rect(offset, size)
+        # which way the view moved since the previous frame, -1, 0 or 1 per axis
+        travel = (offset[0] - previous.offset[0], offset[1] - previous.offset[1]) if previous else (0, 0)
+        self.direction = ((travel[0] > 0) - (travel[0] < 0), (travel[1] > 0) - (travel[1] < 0))
+
+    def area(self, margin=0):
+        return self.rect.inflate(margin * 2, margin * 2)
+
+    def chunks(self, chunk_px, margin=0):
+        return chunks_in(self.rect, chunk_px, margin)
+
+    def ahead(self, chunk_px):
+        """Chunks just outside the view on the side it is moving towards, straight ahead first."""
+        if self.direction == (0, 0):
+            return []
+        visible = self.chunks(chunk_px)
+        center = ((visible[0][0] + visible[-1][0]) / 2, (visible[0][1] + visible[-1][1]) / 2)
+        dx, dy = self.direction
+        ring = [chunk for chunk in self.chunks(chunk_px, 1) if chunk not in visible
+                and (chunk[0] - center[0]) * dx + (chunk[1] - center[1]) * dy > 0]
+        ring.sort(key=lambda chunk: abs((chunk[0] - center[0]) * dy - (chunk[1] - center[1]) * dx))
+        return ring
+
+    def sees(self, rect, margin=0):
+        return self.area(margin).colliderect(rect)
+
+    def entities(self, entities, margin=0):
+        area = self.area(margin)
+        return [entity for entity in entities if area.colliderect(entity.rect)]
+
 class Camera:
     def __init__(self, game_surf_size:tuple|list, tile_size):
         self.size = game_surf_size
@@ -16,6 +56,7 @@ class Camera:
 
         self.scroll = [0, 0]
         self.camera_speed = 10
+        self.view = View((0, 0), self.size)
 
         self.do_shake = False
         self.shake_timer = 0
@@ -63,5 +104,7 @@ class Camera:
         if self.do_shake:
             self.shake()
 
-        return int(self.scroll[0] + self.shake_offset[0] + self.gap[0]), int(self.scroll[1] + self.shake_offset[1] + self.gap[1])
+        offset = int(self.scroll[0] + self.shake_offset[0] + self.gap[0]), int(self.scroll[1] + self.shake_offset[1] + self.gap[1])
+        self.view = View(offset, self.size, self.view)
+        return offset
     
\ No newline at end of file
@@ -21,15 +21,16 @@ class Cursor:
         render_x = pos[0] - surf.get_width()/2
         render_y = pos[1] - surf.get_height()/2
 
-        draw_surf.blit(surf, (render_x, render_y)) # topleft arrow
+        rects = [draw_surf.blit(surf, (render_x, render_y))] # topleft arrow
         for i in [90, 180, 270]:
             img = pygame.transform.rotozoom(self.image, self.angle + i, 1)
             render_x = pos[0] - img.get_width()/2
             render_y = pos[1] - img.get_height()/2
-            draw_surf.blit(img, (render_x, render_y))
+            rects.append(draw_surf.blit(img, (render_x, render_y)))
+        return rects
 
     def update(self, delta_time, draw_surf, pos):
         self.dt = delta_time
 
         self.angle += self.dt
-        self.draw(draw_surf, pos)
+        return self.draw(draw_surf, pos)
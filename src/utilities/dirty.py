@@ -0,0 +1,69 @@
+# utilities/dirty.py — dirty rectangle bookkeeping for partial display updates
+# Layers report the screen rects they drew over the static background, those are restored from it next frame
+# end() hands main.py the merged rects that changed for pygame.display.update, or None when it should flip
+import pygame
+
+def merge(rects, screen):
+    """`rects` clipped to `screen` with overlapping ones joined, empty ones dropped."""
+    merged = []
+    for rect in sorted((pygame.Rect(rect).clip(screen) for rect in rects), key=lambda rect: (rect.x, rect.y)):
+        if not rect.w or not rect.h:
+            continue
+        for index, other in enumerate(merged):
+            if other.colliderect(rect):
+                merged[index] = other.union(rect)
+                break
+        else:
+            merged.append(rect)
+    return merged
+
+class DirtyRects:
+    """What changed on a `size` screen this frame.
+
+    During a frame layers add() what they drew over the background,
+    redraw() marks everything changed (the background was recomposed) and
+    cover() says the screen was just covered whole, so what was drawn
+    before it is hidden.
+    """
+    def __init__(self, size):
+        self.screen = pygame.Rect((0, 0), size)
+        self.last = [self.screen] # drawn over the background last frame
+        self.last_top = [] # drawn on top of last frame's cover
+        self.current = []
+        self.full = True
+        self.covered = self.covered_last = False
+
+    def restore(self, surf, background):
+        """Put `background` back wherever last frame drew over it."""
+        for rect in merge(self.last, self.screen):
+            surf.blit(background, rect, rect)
+
+    def add(self, *rects):
+        self.current += rects
+
+    def redraw(self):
+        self.full = True
+
+    def cover(self):
+        self.covered = True
+        self.current = []
+        if not self.covered_last:
+            self.full = True
+
+    def end(self):
+        """Merged rects that changed since the last frame, None when the whole screen did."""
+        if self.covered:
+            # under a cover nothing but what's on top of it can change
+            changed = self.last_top + self.current
+            self.last, self.last_top = [self.screen], self.current
+        else:
+            changed = self.last + self.current
+            self.last, self.last_top = self.current, []
+        changed = None if self.full else merge(changed, self.screen)
+        if changed and self.screen in changed:
+            changed = None
+
+        self.current = []
+        self.full = False
+        self.covered_last, self.covered = self.covered, False
+        return changed
@@ -0,0 +1,104 @@
+# utilities/gradient.py — array built colour gradients
+# ramp() maps 0..1 values through multi-stop colour ramps, linear/radial_colours build whole images at once
+# linear/radial_gradient write them to a Surface through surfarray, cached by their parameters
+# UpsampledGradient smoothly scales a one pixel per tile image up chunk by chunk under a memory budget
+from functools import lru_cache
+
+import numpy as np
+import pygame
+
+from src.utilities.lru import ByteLRU, surface_bytes
+
+def ramp(t, colours, stops=None):
+    """(..., 3) float colours of `t` along a ramp, `stops` default to evenly spaced."""
+    colours = np.asarray(colours, dtype=np.float64)
+    stops = np.linspace(0, 1, len(colours)) if stops is None else np.asarray(stops, dtype=np.float64)
+    return np.stack([np.interp(t, stops, colours[:, channel]) for channel in range(3)], axis=-1)
+
+def linear_colours(size, colours, stops=None, vertical=True):
+    """(w, h, 3) uint8 linear gradient, the last row/column stops one pixel short of the last colour."""
+    length = size[1] if vertical else size[0]
+    line = ramp(np.arange(length) / length, colours, stops).astype(np.uint8)
+    if vertical:
+        return np.broadcast_to(line[None, :], (size[0], size[1], 3))
+    return np.broadcast_to(line[:, None], (size[0], size[1], 3))
+
+def radial_colours(size, colours, stops=None, center=None, radius=None, origin=(0, 0)):
+    """(w, h, 3) uint8 radial gradient for a window at `origin` of an image.
+
+    `center` defaults to the middle of `size` and `radius` to the corner distance.
+    """
+    cx, cy = center if center is not None else (size[0] / 2, size[1] / 2)
+    radius = radius if radius is not None else (cx**2 + cy**2) ** 0.5
+
+    dx = np.arange(origin[0], origin[0] + size[0]) - cx
+    dy = np.arange(origin[1], origin[1] + size[1]) - cy
+    t = np.minimum(np.sqrt(dx[:, None]**2 + dy[None, :]**2) / radius, 1)
+    return ramp(t, colours, stops).astype(np.uint8)
+
+def colours_surface(colours, alpha=False):
+    surf = pygame.Surface(colours.shape[:2], pygame.SRCALPHA if alpha else 0)
+    surf = surf.convert_alpha() if alpha else surf.convert()
+    pygame.surfarray.blit_array(surf, colours)
+    if alpha: # blit_array leaves alpha alone, per-pixel alpha starts transparent
+        pygame.surfarray.pixels_alpha(surf)[:] = 255
+    return surf
+
+# surfaces are shared by everyone asking for the same gradient, never draw onto them
+@lru_cache(maxsize=16)
+def linear_gradient(size, colours, stops=None, vertical=True, alpha=False):
+    return colours_surface(linear_colours(size, colours, stops, vertical), alpha)
+
+@lru_cache(maxsize=16)
+def radial_gradient(size, colours, stops=None, center=None, radius=None, alpha=False):
+    return colours_surface(radial_colours(size, colours, stops, center, radius), alpha)
+
+def bilinear_axis(start, length, cells, scale):
+    # source cells and weights for `length` output pixels from `start`, pixel centres line up with cell centres
+    pos = ((np.arange(start, start + length) + 0.5) / scale - 0.5).clip(0, cells - 1)
+    low = np.floor(pos).astype(np.intp)
+    return low, np.minimum(low + 1, cells - 1), (pos - low).astype(np.float32)
+
+def upsample(colours, scale, origin, size):
+    """(w, h, 3) uint8 bilinear upsample of `colours` by `scale` for the pixel window at `origin`."""
+    x0, x1, fx = bilinear_axis(origin[0], size[0], colours.shape[0], scale)
+    y0, y1, fy = bilinear_axis(origin[1], size[1], colours.shape[1], scale)
+    fx, fy = fx[:, None, None], fy[None, :, None]
+
+    rows = colours[:, y0] * (1 - fy) + colours[:, y1] * fy # only the cell rows this window needs
+    return (rows[x0] * (1 - fx) + rows[x1] * fx + 0.5).astype(np.uint8)
+
+class UpsampledGradient:
+    """Smooth `scale`x view of a one pixel per cell colour image, built as chunk surfaces on demand.
+
+    The full size image never exists, built chunks are kept in an LRU bounded
+    by `max_bytes` and `peak_bytes` reports the most held at once.
+    """
+    def __init__(self, colours, scale, chunk_px, max_bytes=16 * 1024 * 1024):
+        self.colours = np.asarray(colours, dtype=np.float32)
+        self.scale = scale
+        self.chunk_px = tuple(chunk_px)
+        self.size = (self.colours.shape[0] * scale, self.colours.shape[1] * scale)
+
+        self.chunks = ByteLRU(max_bytes, surface_bytes)
+
+    @property
+    def peak_bytes(self):
+        return self.colours.nbytes + self.chunks.peak_bytes
+
+    def chunk(self, offset):
+        surf = self.chunks.get(offset)
+        if surf is not None:
+            return surf
+
+        origin = (offset[0] * self.chunk_px[0], offset[1] * self.chunk_px[1])
+        size = (min(self.chunk_px[0], self.size[0] - origin[0]), min(self.chunk_px[1], self.size[1] - origin[1]))
+        return self.chunks.put(offset, colours_surface(upsample(self.colours, self.scale, origin, size)))
+
+    def draw(self, surf, camera_offset):
+        view = pygame.Rect(camera_offset, surf.get_size()).clip((0, 0), self.size)
+        if not view.w or not view.h:
+            return
+        for cy in range(view.top // self.chunk_px[1], (view.bottom - 1) // self.chunk_px[1] + 1):
+            for cx in range(view.left // self.chunk_px[0], (view.right - 1) // self.chunk_px[0] + 1):
+                surf.blit(self.chunk((cx, cy)), (cx * self.chunk_px[0] - camera_offset[0], cy * self.chunk_px[1] - camera_offset[1]))
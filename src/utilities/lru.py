@@ -0,0 +1,51 @@
+# utilities/lru.py — least recently used cache bounded by the bytes it holds
+# Shared by the noise fields, baked tile chunks & upsampled gradient chunks, each says how big its values are
+# nbytes / peak_bytes / evicted are kept for memory reports
+from collections import OrderedDict
+
+def surface_bytes(surf):
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+class ByteLRU:
+    """key -> value, the least recently used values are dropped once more than `max_bytes` are held.
+
+    `size_of(value)` gives a value's bytes. The newest value is always kept,
+    even when it is bigger than the budget on its own. Not thread safe, callers
+    sharing one between threads lock around it.
+    """
+    def __init__(self, max_bytes, size_of):
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.peak_bytes = 0 # most held at once
+        self.evicted = 0
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        """The value of `key`, now the most recently used, or `default` if it isn't held."""
+        if key not in self.entries:
+            return default
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, value):
+        if key in self.entries:
+            self.nbytes -= self.size_of(self.entries.pop(key))
+        self.entries[key] = value
+        self.nbytes += self.size_of(value)
+        self.peak_bytes = max(self.peak_bytes, self.nbytes)
+        while self.nbytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.nbytes -= self.size_of(evicted)
+            self.evicted += 1
+        return value
+
+    def clear(self):
+        self.entries.clear()
+        self.nbytes = 0
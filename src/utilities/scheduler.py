@@ -0,0 +1,61 @@
+# utilities/scheduler.py — distance based update levels of detail
+# UpdateScheduler sorts entities into tiers by how far outside the view they are, far tiers step every few frames
+# Entities of a tier are spread over its frames by a per entity phase, skipped time is handed over on their next step
+import numpy as np
+
+class UpdateScheduler:
+    """Which entities step this frame.
+
+    `tiers` are (margin, period) pairs from the nearest out: an entity whose
+    rect touches the view grown by `margin` px steps every `period` frames,
+    the last tier (margin None) takes everything further away. `counts` holds
+    how many entities fell into each tier this frame & `stepped` how many step.
+    """
+    def __init__(self, tile_size, tiers=None):
+        self.tiers = tiers or ((tile_size * 4, 1), (tile_size * 24, 2), (None, 4))
+        self.periods = np.array([period for _, period in self.tiers])
+        self.frame = 0
+        self.areas = []
+        self.counts = [0] * len(self.tiers)
+        self.stepped = 0
+
+    def begin(self, view):
+        """Start a frame against `view`, None puts everything in the nearest tier."""
+        self.frame += 1
+        self.areas = [view.area(margin) for margin, _ in self.tiers[:-1]] if view else None
+        self.counts = [0] * len(self.tiers)
+        self.stepped = 0
+
+    def tier(self, rect):
+        tier = len(self.tiers) - 1
+        if self.areas is None:
+            tier = 0
+        else:
+            for index, area in enumerate(self.areas):
+                if area.colliderect(rect):
+                    tier = index
+                    break
+        self.counts[tier] += 1
+        return tier
+
+    def tiers_of(self, left, top, right, bottom):
+        """tier() for arrays of rect edges at once."""
+        tiers = np.full(left.shape, len(self.tiers) - 1)
+        if self.areas is None:
+            tiers[:] = 0
+        else:
+            for index, area in reversed(list(enumerate(self.areas))):
+                inside = (left < area.right) & (right > area.left) & (top < area.bottom) & (bottom > area.top)
+                tiers[inside] = index
+        self.counts = np.bincount(tiers, minlength=len(self.tiers)).tolist()
+        return tiers
+
+    def due(self, tier, phase):
+        """Whether an entity (or arrays of them) with `phase` steps this frame, counted in `stepped`."""
+        if isinstance(tier, np.ndarray):
+            due = (self.frame + phase) % self.periods[tier] == 0
+            self.stepped += int(np.count_nonzero(due))
+        else:
+            due = (self.frame + phase) % self.tiers[tier][1] == 0
+            self.stepped += due
+        return due
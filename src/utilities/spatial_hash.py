@@ -0,0 +1,45 @@
+# utilities/spatial_hash.py — uniform grid broadphase for entity queries
+# SpatialHash buckets entities by every grid cell their rect overlaps, rebuilt once per tick
+# Queries return candidates in the order the entities were given, callers still run the exact test
+from collections import defaultdict
+
+class SpatialHash:
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = defaultdict(list) # (cx, cy) -> indices into self.items
+        self.items = []
+
+    def cell_range(self, left, top, right, bottom):
+        # cells overlapped by the half open pixel box [left, right) x [top, bottom)
+        cs = self.cell_size
+        return (int(left // cs), int(top // cs), int((right - 1) // cs), int((bottom - 1) // cs))
+
+    def build(self, items):
+        """Re-bucket `items` (anything with a .rect) from scratch."""
+        self.cells.clear()
+        self.items = list(items)
+        for index, item in enumerate(self.items):
+            rect = item.rect
+            x0, y0, x1, y1 = self.cell_range(rect.left, rect.top, rect.right, rect.bottom)
+            for cy in range(y0, y1 + 1):
+                for cx in range(x0, x1 + 1):
+                    self.cells[(cx, cy)].append(index)
+
+    def query_box(self, left, top, right, bottom):
+        x0, y0, x1, y1 = self.cell_range(left, top, right, bottom)
+        found = set()
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell:
+                    found.update(cell)
+        return [self.items[index] for index in sorted(found)]
+
+    def query(self, rect):
+        """Items sharing a cell with `rect`, every item colliding with it is among them."""
+        return self.query_box(rect.left, rect.top, rect.right, rect.bottom)
+
+    def nearby(self, center, radius):
+        """Items whose rect comes near the square around `center`, a superset of those within `radius`."""
+        # one pixel of slack, float positions sit up to a pixel away from their rect
+        return self.query_box(center[0] - radius - 1, center[1] - radius - 1, center[0] + radius + 2, center[1] + radius + 2)
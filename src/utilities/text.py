@@ -22,6 +22,7 @@ class TextManager:
         self.cooldown = 60
 
         self.need_input = False
+        self.drawn = [] # screen rects of the texts last drawn
 
     def queue_text(self, text, font=None, pos=None, cooldown=60):
         """
@@ -42,12 +43,13 @@ class TextManager:
         Draws all texts from the render queue onto the screen.
         """
         self.need_input = False
-        
+        self.drawn = []
+
         for item in self.render_queue.copy():
             text, font, pos, cooldown = item
             img = font.render(text, False, "white")
             rect = img.get_rect(**pos)
-            draw_surf.blit(img, rect)
+            self.drawn.append(draw_surf.blit(img, rect))
 
             if item[-1] != None:
                 item[-1] -= dt
@@ -0,0 +1,51 @@
+# utilities/transform_cache.py — shared cache of scaled, tinted & rotated sprites
+# Entities squash, flicker & tilt every frame, the results are keyed by pixel size, whole degrees & tint and reused
+# Bounded, least recently used entries are dropped first
+from collections import OrderedDict
+from functools import lru_cache
+
+import pygame
+
+class TransformCache:
+    """`image` scaled by (scale_x, scale_y), filled with `tint` then rotated by `angle`.
+
+    Scales are keyed by the pixel size they produce, so they look exactly
+    like an uncached transform.scale, angles are rounded to `angle_step`
+    degrees. `hits` & `misses` count lookups since the last clear().
+    """
+    def __init__(self, max_size=512, angle_step=1):
+        self.max_size = max_size
+        self.angle_step = angle_step
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, image, scale_x=1, scale_y=1, angle=0, tint=None):
+        size = int(image.get_width() * scale_x), int(image.get_height() * scale_y)
+        angle = round(angle / self.angle_step) * self.angle_step
+        key = image, size, angle, tint
+        img = self.entries.get(key)
+        if img is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return img
+
+        self.misses += 1
+        img = pygame.transform.scale(image, size)
+        if tint is not None:
+            img.fill(tint)
+        if angle:
+            img = pygame.transform.rotate(img, angle)
+        self.entries[key] = img
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return img
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = 0
+
+@lru_cache(maxsize=1)
+def transform_cache():
+    # one cache for every entity, so enemies sharing a sprite share results
+    return TransformCache()
@@ -1,9 +1,60 @@
 # weapon/bullet.py — Bullet object and manager-facing logic
 # Handles movement, rendering with flash/shadow, collision & lifetime
-# Used by RangeWeapon to spawn projectiles
+# Used by RangeWeapon to spawn projectiles, their sprites come pre-rotated from a shared BulletSprites cache
 import pygame, math, random
+from functools import lru_cache
 from pygame.math import Vector2 as vec2
 
+from src.utilities.spatial_hash import SpatialHash
+
+class BulletSprites:
+    """Bullet image, shadow & flash built once, rotated into `bins` angle steps on first use.
+
+    `image(step)` & `shadow(step)` take an angle step from `step_of()`,
+    `flash(degrees)` a whole number of degrees.
+    """
+    def __init__(self, tile_size, bins=64):
+        self.bins = bins
+        self.base_image = pygame.Surface((tile_size, tile_size/2), pygame.SRCALPHA).convert_alpha()
+        pygame.draw.rect(self.base_image, '#a97dff', (0, 0, tile_size, tile_size/2))  # lavender bullet
+        pygame.draw.rect(self.base_image, '#ffffff', (1, 1, tile_size - 2, tile_size/2 - 2))  # white inner highlight
+
+        self.base_shadow = pygame.mask.from_surface(self.base_image)
+        self.base_shadow = self.base_shadow.to_surface(setcolor=(255, 255, 255, 255), unsetcolor=(0, 0, 0, 0))
+        self.base_shadow.fill((0, 0, 0))
+        self.base_shadow.set_alpha(48)
+        self.shadow_offset = self.base_shadow.get_height()
+
+        self.base_flash = pygame.Surface((tile_size, tile_size)).convert_alpha()
+        self.base_flash.fill('white')
+
+        self.images = [None] * bins
+        self.shadows = [None] * bins
+        self.flashes = {} # degrees -> surface
+
+    def step_of(self, angle):
+        return round(angle * self.bins / 360) % self.bins
+
+    def image(self, step):
+        if self.images[step] is None:
+            self.images[step] = pygame.transform.rotozoom(self.base_image, -step * 360 / self.bins, 1)
+        return self.images[step]
+
+    def shadow(self, step):
+        if self.shadows[step] is None:
+            self.shadows[step] = pygame.transform.rotate(self.base_shadow, -step * 360 / self.bins)
+        return self.shadows[step]
+
+    def flash(self, degrees):
+        if degrees not in self.flashes:
+            self.flashes[degrees] = pygame.transform.rotate(self.base_flash, degrees)
+        return self.flashes[degrees]
+
+@lru_cache(maxsize=4)
+def bullet_sprites(tile_size):
+    # one set per tile size, shared by every bullet
+    return BulletSprites(tile_size)
+
 class Bullet:
     def __init__(self, tile_size, pos, angle):
         self.tile_size = tile_size
@@ -11,26 +62,19 @@ class Bullet:
 
         self.hitbox = [self.tile_size/4, self.tile_size/4, self.tile_size/2, self.tile_size/2]
 
-        self.image = pygame.Surface((self.tile_size, self.tile_size/2), pygame.SRCALPHA).convert_alpha()
-        pygame.draw.rect(self.image, '#a97dff', (0, 0, self.tile_size, self.tile_size/2))  # lavender bullet
-        pygame.draw.rect(self.image, '#ffffff', (1, 1, self.tile_size - 2, self.tile_size/2 - 2))  # white inner highlight
-
-        self.shadow = pygame.mask.from_surface(self.image)
-        self.shadow = self.shadow.to_surface(setcolor=(255, 255, 255, 255), unsetcolor=(0, 0, 0, 0))
-        self.shadow.fill((0, 0, 0))
-        self.shadow.set_alpha(48)
+        self.sprites = bullet_sprites(tile_size)
+        self.step = self.sprites.step_of(angle)
 
         self.x, self.y = pos[0] + self.tile_size * math.cos(math.radians(self.angle)), pos[1] + self.tile_size * math.sin(math.radians(self.angle))
         self.rect = pygame.Rect((0, 0), (self.hitbox[2], self.hitbox[3]))
         self.rect.center = (self.x, self.y)
+        self.last_pos = self.rect.topleft # where the hitbox was before this tick's move
 
         self.vel = vec2(1, 0)
         self.vel = self.vel.rotate(self.angle)
         self.speed = 10
 
-        self.flash = pygame.Surface((self.tile_size, self.tile_size)).convert_alpha()
-        self.flash.fill('white')
-        self.flash = pygame.transform.rotate(self.flash, random.randint(0, 45))
+        self.flash_angle = random.randint(0, 45)
         self.flash_timer = 0.8
 
         self.destruction_timer = 1000
@@ -41,26 +85,25 @@ class Bullet:
 
     def draw(self, draw_surf, camera_offset):
         if self.flash_timer > 0:
-            img = self.flash
+            img = self.sprites.flash(self.flash_angle)
         else:
-            img = self.image 
-            img = pygame.transform.rotozoom(img, -self.angle, 1)
+            img = self.sprites.image(self.step)
         render_x = self.rect.x - camera_offset[0] - (img.get_width() - self.hitbox[2]) / 2
         render_y = self.rect.y - camera_offset[1] - (img.get_height() - self.hitbox[3]) / 2
-        
-        shadow_img = pygame.transform.rotate(self.shadow, -self.angle)
 
-        draw_surf.blit(shadow_img, (render_x, render_y + self.shadow.get_height()))
-        draw_surf.blit(img, (render_x, render_y))
+        return [draw_surf.blit(self.sprites.shadow(self.step), (render_x, render_y + self.sprites.shadow_offset)),
+                draw_surf.blit(img, (render_x, render_y))]
         # pygame.draw.polygon(draw_surf, 'red', [(self.rect.x - camera_offset[0], self.rect.y - camera_offset[1]), (self.rect.x - camera_offset[0] + self.hitbox[2], self.rect.y - camera_offset[1]), (self.rect.x - camera_offset[0] + self.hitbox[2], self.rect.y - camera_offset[1] + self.hitbox[3]), (self.rect.x - camera_offset[0], self.rect.y - camera_offset[1] + self.hitbox[3])], 1)
         # pygame.draw.rect(draw_surf, 'red', (self.rect.x - camera_offset[0], self.rect.y - camera_offset[1], self.hitbox[2], self.hitbox[3]), 1)
 
-    def collision(self, tile):
-        if tile is None:
-            return True
-        if self.rect.colliderect(tile.rect) and tile.tile_type not in ('air', 'edge'):
-            return True
-        return False
+    def segment(self):
+        """The path the hitbox's top left travelled this tick, swept against the terrain."""
+        return self.last_pos, self.rect.topleft
+
+    def stop(self, point):
+        # pull the bullet back to where its hitbox's top left hit the terrain
+        self.x, self.y = point[0] + self.rect.w / 2, point[1] + self.rect.h / 2
+        self.rect.center = (self.x, self.y)
 
     def destroy(self):
         self.destruction_timer -= self.dt
@@ -70,6 +113,7 @@ class Bullet:
 
     def update(self, delta_time):
         self.dt = delta_time
+        self.last_pos = self.rect.topleft
 
         self.x += self.vel.x * self.speed * self.dt
         self.y += self.vel.y * self.speed * self.dt
@@ -86,13 +130,17 @@ class BulletManager:
 
         self.bullets = []
         self.damage = 1
+        self.grid = SpatialHash(self.tile_size * 2) # rebuilt every tick in Game.entities_collisions
 
     def add_bullet(self, pos, angle):
         self.bullets.append(Bullet(self.tile_size, pos, angle))
     
-    def draw(self, draw_surf, camera_offset):
-        for bullet in self.bullets:
-            bullet.draw(draw_surf, camera_offset)
+    def draw(self, draw_surf, camera_offset, view=None):
+        # margin leaves room for the rotated sprite, flash & shadow
+        rects = []
+        for bullet in view.entities(self.bullets, self.tile_size * 2) if view else self.bullets:
+            rects += bullet.draw(draw_surf, camera_offset)
+        return rects
 
     def update(self, delta_time):
         self.dt = delta_time
@@ -0,0 +1,14 @@
+# tests/conftest.py — shared pytest setup
+# Headless pygame with a tiny window, sprites convert() against it like in game
+# Run from the repo root: python -m pytest
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+import pytest
+
+@pytest.fixture(scope='session', autouse=True)
+def display():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.quit()
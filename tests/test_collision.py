@@ -0,0 +1,56 @@
+# tests/test_collision.py — bullet sweeps through the blocking grid
+# sweep_all steps every segment at once & must report exactly what sweep() does for each one
+import random
+
+import numpy as np
+import pytest
+
+from src.tiling.collision import BlockingGrid, sweep, sweep_all
+from src.tiling.tilemap import BLOCKS_MOVEMENT
+
+TILE_SIZE = 16
+GRID_SIZE = (40, 30)
+
+class Layer:
+    # just what BlockingGrid reads from a TileMap
+    def __init__(self, flags, codes):
+        self.tile_size = TILE_SIZE
+        self.origin = (0, 0)
+        self.size = flags.shape
+        self.flags = flags
+        self.codes = codes
+
+def blocking_grid(seed, void):
+    rng = np.random.default_rng(seed)
+    flags = (rng.random(GRID_SIZE) < 0.1).astype(np.uint8) * BLOCKS_MOVEMENT
+    codes = np.where(rng.random(GRID_SIZE) < 0.05, 255, 0).astype(np.uint8) # a few VOID holes
+    return BlockingGrid(Layer(flags, codes), Layer(np.zeros_like(flags), codes), void=void)
+
+def segments(seed, count):
+    random.seed(seed)
+    width, height = GRID_SIZE[0] * TILE_SIZE, GRID_SIZE[1] * TILE_SIZE
+    result = []
+    for _ in range(count):
+        start = (random.uniform(-20, width + 20), random.uniform(-20, height + 20))
+        kind = random.random()
+        if kind < 0.2: # on tile borders & along them
+            start = (random.randrange(GRID_SIZE[0]) * TILE_SIZE, random.randrange(GRID_SIZE[1]) * TILE_SIZE)
+            end = (start[0] + random.choice((-2, 0, 3)) * TILE_SIZE, start[1] + random.choice((-1, 0, 2)) * TILE_SIZE)
+        elif kind < 0.3: # axis aligned
+            end = (start[0], start[1] + random.uniform(-200, 200)) if random.random() < 0.5 else (start[0] + random.uniform(-200, 200), start[1])
+        elif kind < 0.4: # not moving
+            end = start
+        else: # a bullet's tick, up to fast ones crossing many tiles
+            end = (start[0] + random.uniform(-150, 150), start[1] + random.uniform(-150, 150))
+        result.append((start, end))
+    return result
+
+@pytest.mark.parametrize('void', (False, True))
+@pytest.mark.parametrize('seed', range(5))
+def test_sweep_all_matches_sweep(seed, void):
+    grid = blocking_grid(seed, void)
+    batch = segments(seed, 500)
+    assert sweep_all(grid, batch) == [sweep(grid, start, end) for start, end in batch]
+
+def test_sweep_all_without_segments():
+    assert sweep_all(blocking_grid(0, False), []) == []
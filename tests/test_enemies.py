@@ -0,0 +1,29 @@
+# tests/test_enemies.py — the batched enemy backend against one object per enemy
+# Both draw the same random numbers, so the same crowd must end up in the same places after every tick
+import random
+
+import numpy as np
+import pytest
+
+from benchmarks.enemies import blocking_grid, crowd, Target, CENTER, VIEW
+from src.entities.enemy import EnemyManager
+from src.entities.enemy_batch import BatchedEnemyManager
+
+TICKS = 60
+
+def positions(manager):
+    return [(enemy.x, enemy.y) for enemy in manager.enemies]
+
+@pytest.mark.parametrize('count', (1, 50, 400))
+@pytest.mark.parametrize('view', (None, VIEW))
+def test_batched_enemies_match_objects(count, view):
+    grid = blocking_grid(np.random.default_rng(count))
+    objects = crowd(EnemyManager, count, count)
+    batched = crowd(BatchedEnemyManager, count, count)
+    player = Target(*CENTER)
+    for tick in range(TICKS):
+        player.x = CENTER[0] + 200 * np.cos(tick / 10)
+        for manager in (objects, batched):
+            random.seed(count * TICKS + tick) # dash swerves
+            manager.update(1.0, player, grid, view=view)
+        assert positions(batched) == positions(objects), tick
@@ -0,0 +1,21 @@
+# tests/test_terrain.py — vectorised noise against the noise package it replaces
+# perlin_grid must give noise.pnoise2's values bit for bit, for every seed random.randint(0, 256) can pick
+import noise
+import numpy as np
+import pytest
+
+from src.tiling.terrain import perlin_grid
+
+# the world's corner & a window past the 1024 tile repeat of the lattice, where the wrap kicks in
+WINDOWS = (((0, 0), (24, 16)), ((1010, 1015), (24, 16)))
+
+def pnoise_grid(origin, size, base):
+    # how generate_world_data sampled it, one call per tile
+    return np.array([[noise.pnoise2(x * 0.05, y * 0.08, octaves=2, persistence=0.5, base=base)
+                      for y in range(origin[1], origin[1] + size[1])]
+                     for x in range(origin[0], origin[0] + size[0])], dtype=np.float32)
+
+@pytest.mark.parametrize('base', range(257))
+def test_perlin_grid_matches_pnoise2(base):
+    for origin, size in WINDOWS:
+        assert np.array_equal(perlin_grid(origin, size, base=base), pnoise_grid(origin, size, base))
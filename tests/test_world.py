@@ -0,0 +1,84 @@
+# tests/test_world.py — world building shortcuts against the plain way of getting the same layers
+# Parallel strips == one process, the disk cache gives back what was stored, chamfer coast distance == BFS
+from collections import deque
+
+import numpy as np
+import pytest
+
+from src.tiling.parallel import WorldBuilder, LAYER_ARRAYS
+from src.tiling.world import build_region, outline_distance, is_walkable, NEIGHBOR_BITS, VOID
+from src.tiling.world_cache import WorldCache
+from src.tiling.terrain import AIR, DIRT, DIRT2, EDGE
+
+WORLD_SIZE = (80, 60)
+SEEDS = (0, 7, 256)
+
+def assert_same_layers(layers, expected):
+    for name in LAYER_ARRAYS:
+        assert np.array_equal(getattr(layers, name), getattr(expected, name)), name
+    assert layers.max_distance == expected.max_distance
+
+@pytest.fixture(scope='module')
+def builder():
+    # small strips, so strips further from the coast than their halo get rebuilt too
+    builder = WorldBuilder(workers=2, strip_rows=6)
+    yield builder
+    builder.shutdown()
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_parallel_build_matches_serial(builder, seed):
+    assert_same_layers(builder.build(seed, WORLD_SIZE), build_region(seed, (0, 0), WORLD_SIZE, WORLD_SIZE))
+
+def test_world_cache_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setenv('ABYSS_WORLD_CACHE', str(tmp_path))
+    cache = WorldCache()
+    layers = build_region(3, (0, 0), WORLD_SIZE, WORLD_SIZE)
+
+    assert cache.load(3, WORLD_SIZE) is None
+    assert cache.store(3, WORLD_SIZE, layers)
+    assert_same_layers(cache.load(3, WORLD_SIZE), layers)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # another seed or size is another world
+    assert cache.load(4, WORLD_SIZE) is None
+    assert cache.load(3, (WORLD_SIZE[0], WORLD_SIZE[1] + 1)) is None
+
+def test_world_cache_damaged_file_is_a_miss(tmp_path):
+    cache = WorldCache(str(tmp_path))
+    assert cache.store(3, WORLD_SIZE, build_region(3, (0, 0), WORLD_SIZE, WORLD_SIZE))
+    with open(cache.path(3, WORLD_SIZE), 'r+b') as f:
+        f.write(b'garbage!')
+    assert cache.load(3, WORLD_SIZE) is None
+
+def bfs_distance(ground):
+    # breadth first search over walkable tiles from the outline, VOID is coast & the window border is not
+    w, h = ground.shape
+    walkable = is_walkable(ground)
+    distance = np.full(ground.shape, -1, dtype=np.int32)
+    queue = deque()
+    for x in range(w):
+        for y in range(h):
+            if walkable[x, y] and any(0 <= x + dx < w and 0 <= y + dy < h and not walkable[x + dx, y + dy] for dx, dy in NEIGHBOR_BITS):
+                distance[x, y] = 0
+                queue.append((x, y))
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in NEIGHBOR_BITS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < w and 0 <= ny < h and walkable[nx, ny] and distance[nx, ny] < 0:
+                distance[nx, ny] = distance[x, y] + 1
+                queue.append((nx, ny))
+    return distance
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_outline_distance_matches_bfs_on_worlds(seed):
+    ground = build_region(seed, (0, 0), WORLD_SIZE, WORLD_SIZE).ground
+    assert np.array_equal(outline_distance(ground), bfs_distance(ground))
+
+@pytest.mark.parametrize('seed', range(20))
+def test_outline_distance_matches_bfs_on_noise(seed):
+    # scattered tiles of every kind, lakes & windows without any coast included
+    rng = np.random.default_rng(seed)
+    codes = np.array((AIR, DIRT, DIRT2, EDGE, VOID), dtype=np.uint8)
+    ground = codes[rng.choice(len(codes), size=(30, 20), p=(0.1, 0.4, 0.4, 0.05, 0.05) if seed else (0, 0.5, 0.5, 0, 0))]
+    assert np.array_equal(outline_distance(ground), bfs_distance(ground))